@@ -8,6 +8,7 @@ import json
 from datetime import datetime
 from typing import Optional, Dict
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -94,6 +95,8 @@ active_agents = {}  # {session_id: {'activated': True/False, 'token': ..., 'stab
 agent_results = {}  # {session_id: latest_analysis_result}
 agent_tasks = {}  # {session_id: background_task}
 agent_price_history = {}  # {session_id: [{'price': float, 'timestamp': str}]} - Track price history for live updates
+byok_sentiment_analyzers = {}  # {gemini_api_key: SentimentAnalyzer} - Reuse BYOK Gemini clients across requests
+MAX_BYOK_ANALYZERS = 32
 
 
 class PerpTradeRequest(BaseModel):
@@ -192,6 +195,21 @@ def calculate_perp_trade_details(recommendation: str, market_data: dict,
     }
 
 
+async def get_byok_sentiment_analyzer(gemini_api_key: str) -> SentimentAnalyzer:
+    """Get (or create) the SentimentAnalyzer for a user-provided Gemini key"""
+    # Pop and re-insert so the pool stays in least-recently-used order
+    analyzer = byok_sentiment_analyzers.pop(gemini_api_key, None)
+    if analyzer is None:
+        if len(byok_sentiment_analyzers) >= MAX_BYOK_ANALYZERS:
+            # Close the least recently used analyzer to keep the pool (and its
+            # Gemini connections) bounded
+            evicted = byok_sentiment_analyzers.pop(next(iter(byok_sentiment_analyzers)))
+            await evicted.close()
+        analyzer = SentimentAnalyzer(gemini_api_key)
+    byok_sentiment_analyzers[gemini_api_key] = analyzer
+    return analyzer
+
+
 async def perform_analysis(token: str, stablecoin: str, portfolio_amount: float, 
                           risk_level: str, session_id: str = "default",
                           cmc_api_key: Optional[str] = None,
@@ -214,7 +232,7 @@ async def perform_analysis(token: str, stablecoin: str, portfolio_amount: float,
     
     # Use user-provided API keys if available, otherwise fall back to env vars
     user_cmc = CoinMarketCapAPI(cmc_api_key) if cmc_api_key else cmc
-    user_sentiment_analyzer = SentimentAnalyzer(gemini_api_key) if gemini_api_key else sentiment_analyzer
+    user_sentiment_analyzer = (await get_byok_sentiment_analyzer(gemini_api_key)) if gemini_api_key else sentiment_analyzer
     
     # Step 1: Fetch market data for the token we want to trade
     # Always fetch fresh data - no caching - make actual API call
@@ -1067,7 +1085,8 @@ async def get_component_status(token: str = "BTC"):
     """
     try:
         status = await component_monitor.check_all_components(token)
-        return status
+        # Serialized by orjson in one pass, datetimes included
+        return ORJSONResponse(status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking component status: {str(e)}")
 
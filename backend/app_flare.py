@@ -5,26 +5,44 @@ This replaces direct API calls with verified Flare data sources
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Tuple
 import os
 from dotenv import load_dotenv
 import asyncio
+import time
+import logging
+import logging.handlers
+import queue
 from datetime import datetime
 
 # Import Flare modules
 from flare_data_connector import FlareDataConnector
 from ftso_price_feed import FTSOPriceFeed
 from flare_verifier import FlareVerifier
-from sentiment_analyzer import SentimentAnalyzer
+from sentiment_analyzer import SentimentAnalyzer, SentimentBatcher
+from config import CACHE_ENABLED, CACHE_TTL_SECONDS, SENTIMENT_BATCH, LOG_LEVEL
 
 load_dotenv()
 
+# Log through a queue so message formatting and stdout I/O happen on the
+# listener thread instead of blocking the event loop during requests
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.propagate = False
+
 app = FastAPI(
     title="VERDICT - Perp DEX Analyzer API",
     description="Real-time sentiment and on-chain analysis with Flare FDC verification",
-    version="2.0.0-flare"
+    version="2.0.0-flare",
+    # orjson serializes responses in C instead of json.dumps
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -44,6 +62,38 @@ sentiment_analyzer = SentimentAnalyzer(
     api_key=os.getenv("GEMINI_API_KEY"),
     fdc_connector=fdc
 )
+sentiment_batcher = SentimentBatcher(
+    sentiment_analyzer,
+    max_batch_size=SENTIMENT_BATCH["max_batch_size"],
+    max_latency_ms=SENTIMENT_BATCH["max_latency_ms"]
+)
+
+# Analysis response cache: {(token, stablecoin, risk_level): (expires_at, response)}
+# Identical requests within the TTL skip the FTSO/FDC/Gemini round-trips.
+# Concurrent identical misses share one in-flight analysis, which is dropped
+# from analysis_inflight as soon as it finishes.
+ANALYSIS_CACHE_MAX_ENTRIES = 1024
+analysis_cache = {}
+analysis_inflight = {}
+
+# Health check response cache - load balancer probes reuse it for a few seconds
+HEALTH_CACHE_TTL_SECONDS = 2.0
+health_cache = {"expires_at": 0.0, "response": None}
+
+# Trading signals indexed by signal_idx + 1
+SIGNALS = ("SHORT", "HOLD", "LONG")
+
+# Timestamps are served at 1-second granularity: [epoch_second, isoformat string]
+_ts_cache = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO string, re-formatted at most once per second"""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+        _ts_cache[0] = t
+    return _ts_cache[1]
 
 # Request/Response models
 class AnalysisRequest(BaseModel):
@@ -64,6 +114,21 @@ class AnalysisResponse(BaseModel):
     verification_hash: Optional[str]
     timestamp: str
 
+@app.on_event("startup")
+async def warmup():
+    """Open upstream connections before the first request arrives"""
+    await asyncio.gather(
+        ftso.warmup(),
+        fdc.get_verified_sentiment("BTC"),
+        return_exceptions=True
+    )
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close upstream sessions and flush any queued log records"""
+    await asyncio.gather(fdc.close(), ftso.close(), sentiment_analyzer.close(), return_exceptions=True)
+    log_listener.stop()
+
 @app.get("/")
 async def root():
     return {
@@ -79,7 +144,10 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check with Flare service status"""
+    """Health check with Flare service status (cached briefly for frequent probes)"""
+    now = time.monotonic()
+    if now < health_cache["expires_at"]:
+        return health_cache["response"]
     
     # Check FDC connectivity
     fdc_status = "configured" if fdc else "not_configured"
@@ -88,11 +156,11 @@ async def health_check():
     ftso_status = "configured" if ftso else "not_configured"
     
     # Check verifier contract
-    verifier_status = "configured" if verifier and verifier.contract else "not_configured"
+    verifier_status = "configured" if verifier and getattr(verifier, "contract", None) else "not_configured"
     
-    return {
+    response = {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "services": {
             "fdc": fdc_status,
             "ftso": ftso_status,
@@ -102,27 +170,77 @@ async def health_check():
         "contract_address": os.getenv("VERIFIER_CONTRACT_ADDRESS"),
         "network": "coston2"
     }
+    health_cache["expires_at"] = now + HEALTH_CACHE_TTL_SECONDS
+    health_cache["response"] = response
+    return response
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
 async def analyze_token(request: AnalysisRequest):
     """
     Analyze token with Flare FDC/FTSO verification
+    
+    Responses are cached per (token, stablecoin, risk_level) for the
+    sentiment TTL configured in config.py.
+    """
+    # Normalize once so the cache key, upstream lookups and response agree
+    request.token = request.token.strip().upper()
+    
+    if not CACHE_ENABLED:
+        response, _ = await run_analysis(request)
+        return response
+    
+    cache_key = (request.token, request.stablecoin.upper(), request.risk_level.lower())
+    
+    cached = analysis_cache.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    # Singleflight: a miss already being analyzed is awaited, not requested again
+    inflight = analysis_inflight.get(cache_key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_analyze_and_cache(cache_key, request))
+        analysis_inflight[cache_key] = inflight
+        inflight.add_done_callback(lambda _: analysis_inflight.pop(cache_key, None))
+    
+    # Shielded so a disconnecting client doesn't cancel the analysis others are waiting on
+    return await asyncio.shield(inflight)
+
+
+async def _analyze_and_cache(cache_key: tuple, request: AnalysisRequest) -> AnalysisResponse:
+    """Uncached analysis whose response is stored under cache_key unless it used fallback data"""
+    response, cacheable = await run_analysis(request)
+    if cacheable:
+        if len(analysis_cache) >= ANALYSIS_CACHE_MAX_ENTRIES:
+            analysis_cache.pop(next(iter(analysis_cache)))
+        analysis_cache[cache_key] = (
+            time.monotonic() + CACHE_TTL_SECONDS["sentiment"],
+            response
+        )
+    return response
+
+
+async def run_analysis(request: AnalysisRequest) -> Tuple[AnalysisResponse, bool]:
+    """
+    Run the full FTSO + FDC + Gemini + on-chain verification pipeline
+    
+    Returns:
+        Tuple of (response, cacheable) - cacheable is False when the FTSO
+        price, FDC data or sentiment came from a fallback
     """
     try:
-        print(f"\n[VERDICT Analysis] Starting for {request.token}")
-        print(f"[Verification Pipeline] Step 1: FDC Data Request")
+        logger.info("[VERDICT Analysis] Starting for %s", request.token)
+        logger.info("[Verification Pipeline] Step 1: FDC Data Request")
         
-        # STEP 1: Get verified price from FTSO
-        ftso_price_data = await ftso.get_price(f"{request.token}/USD")
+        # STEP 1 + 2: Get verified price from FTSO and verified sentiment data
+        # from FDC. The two fetches are independent network round-trips, so
+        # run them concurrently instead of paying for both sequentially.
+        ftso_task = asyncio.create_task(ftso.get_price(f"{request.token}/USD"))
+        fdc_task = asyncio.create_task(fdc.get_verified_sentiment(request.token))
+        ftso_price_data, verified_sentiment_data = await asyncio.gather(ftso_task, fdc_task)
         ftso_price = ftso_price_data.price
-        
-        print(f"[FTSO] Price: ${ftso_price:.2f} (Verified: {ftso_price > 0})")
-        
-        # STEP 2: Get verified sentiment data from FDC (if available)
-        # For now, use direct sentiment with FDC metadata
-        verified_sentiment_data = await fdc.get_verified_sentiment(request.token)
-        
-        print(f"[FDC] Sentiment data verified: {verified_sentiment_data.verified}")
+
+        logger.info("[FTSO] Price: $%.2f (Verified: %s)", ftso_price, ftso_price > 0)
+        logger.info("[FDC] Sentiment data verified: %s", verified_sentiment_data.verified)
         
         # STEP 3: Analyze with Gemini AI (includes verification context)
         market_data = {
@@ -134,7 +252,7 @@ async def analyze_token(request: AnalysisRequest):
             "volume_24h": 0
         }
         
-        sentiment_result = await sentiment_analyzer.analyze_token_sentiment(
+        sentiment_result = await sentiment_batcher.analyze_token_sentiment(
             token_symbol=request.token,
             token_name=request.token,
             market_data=market_data,
@@ -144,27 +262,22 @@ async def analyze_token(request: AnalysisRequest):
         sentiment_score = sentiment_result.get("overall_sentiment", 0)
         fdc_verified = sentiment_result.get("fdc_verified", False)
         
-        print(f"[Gemini AI] Sentiment: {sentiment_score:.2f} (FDC Verified: {fdc_verified})")
+        logger.info("[Gemini AI] Sentiment: %.2f (FDC Verified: %s)", sentiment_score, fdc_verified)
         
         # STEP 4: Generate trading signal
-        if sentiment_score > 20 and ftso_price > 0:
-            signal = "LONG"
-            confidence = min(0.7 + (sentiment_score / 200), 0.95)
-        elif sentiment_score < -20:
-            signal = "SHORT"
-            confidence = min(0.7 + (abs(sentiment_score) / 200), 0.95)
-        else:
-            signal = "HOLD"
-            confidence = 0.6
+        # signal_idx: -1 = SHORT, 0 = HOLD, 1 = LONG (LONG needs a live FTSO price)
+        signal_idx = int(sentiment_score > 20 and ftso_price > 0) - int(sentiment_score < -20)
+        signal = SIGNALS[signal_idx + 1]
+        confidence = 0.6 if signal_idx == 0 else min(0.7 + (abs(sentiment_score) / 200), 0.95)
         
-        print(f"[Decision] {signal} with {confidence*100:.1f}% confidence")
+        logger.info("[Decision] %s with %.1f%% confidence", signal, confidence * 100)
         
         # STEP 5: Verify on-chain (if data is verified)
         contract_verified = None
         verification_hash = None
         
         if fdc_verified and verified_sentiment_data.verified:
-            print(f"[Smart Contract] Submitting for on-chain verification...")
+            logger.info("[Smart Contract] Submitting for on-chain verification...")
             try:
                 decision_id, is_valid = await verifier.verify_decision_on_chain(
                     symbol=f"{request.token}/USD",
@@ -174,9 +287,9 @@ async def analyze_token(request: AnalysisRequest):
                 )
                 contract_verified = is_valid
                 verification_hash = decision_id
-                print(f"[Smart Contract] Verified: {is_valid}, Hash: {decision_id[:16]}...")
+                logger.info("[Smart Contract] Verified: %s, Hash: %s...", is_valid, decision_id[:16])
             except Exception as e:
-                print(f"[Smart Contract] Verification skipped: {e}")
+                logger.warning("[Smart Contract] Verification skipped: %s", e)
                 contract_verified = False
         
         # Build response
@@ -190,28 +303,45 @@ async def analyze_token(request: AnalysisRequest):
             fdc_verified=fdc_verified,
             contract_verified=contract_verified,
             verification_hash=verification_hash,
-            timestamp=datetime.now().isoformat()
+            timestamp=_now_iso()
         )
         
-        print(f"[VERDICT] ✅ Analysis complete - {signal} signal")
-        return response
+        logger.info("[VERDICT] ✅ Analysis complete - %s signal", signal)
+        cacheable = (
+            ftso_price > 0
+            and verified_sentiment_data.verified
+            and sentiment_result.get("risk_level") != "Unknown"
+        )
+        return response, cacheable
         
     except Exception as e:
-        print(f"[Error] Analysis failed: {e}")
+        logger.error("[Error] Analysis failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/stats")
-async def get_verification_stats():
-    """Get verification statistics from smart contract"""
+async def get_verification_stats(decision_id: Optional[str] = None):
+    """
+    Get verification statistics from smart contract
+    
+    With a decision_id (the verification_hash from /api/analyze), its
+    validity is read in the same Multicall3 round-trip as the statistics.
+    """
     try:
-        stats = await verifier.get_statistics()
-        return {
+        if decision_id:
+            stats, decision_valid = await verifier.get_statistics_with_status(decision_id)
+        else:
+            stats = await verifier.get_statistics()
+        response = {
             "total_decisions": stats["total"],
             "valid_decisions": stats["valid"],
             "invalid_decisions": stats["invalid"],
             "success_rate": stats["success_rate"],
             "contract_address": os.getenv("VERIFIER_CONTRACT_ADDRESS")
         }
+        if decision_id:
+            response["decision_id"] = decision_id
+            response["decision_valid"] = decision_valid
+        return response
     except Exception as e:
         return {"error": str(e)}
 
@@ -222,4 +352,23 @@ async def serve_dashboard():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop + httptools when they are installed (not on Windows)
+    # and falls back to the pure-Python event loop and HTTP parser otherwise.
+    # Workers need the app as an import string; caches are per worker process.
+    workers = int(os.getenv("WORKERS", "1"))
+    if workers > 1 and getattr(verifier, "contract", None) and getattr(verifier, "account", None):
+        # The verifier's _tx_lock only serializes sends within one process, so
+        # separate worker processes can read the same pending nonce concurrently
+        # and send conflicting transactions
+        raise SystemExit(
+            "WORKERS > 1 is not supported while on-chain verification is enabled "
+            "(DEPLOYER_PRIVATE_KEY and VERIFIER_CONTRACT_ADDRESS are set)"
+        )
+    uvicorn.run(
+        "app_flare:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=workers
+    )
@@ -3,8 +3,13 @@ Component Health Monitoring System for VERDICT
 Tracks the health status of all verification components (FTSO, CMC API, FDC, Contract)
 """
 
+import asyncio
+import time
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from abc import ABC, abstractmethod
+from typing import Deque, Dict, Iterable, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +18,10 @@ logger = logging.getLogger(__name__)
 class ComponentStatus:
     """Represents the status of a single component"""
     
+    __slots__ = ("name", "component_type", "status", "last_check", "last_success",
+                 "error_message", "response_time_ms", "metadata", "consecutive_failures",
+                 "last_good", "good_metadata")
+    
     def __init__(self, name: str, component_type: str):
         self.name = name
         self.component_type = component_type
@@ -22,224 +31,374 @@ class ComponentStatus:
         self.error_message = None
         self.response_time_ms = None
         self.metadata = {}
+        self.consecutive_failures = 0
+        # Metadata of the last healthy probe, reported (flagged stale) while failing
+        self.last_good = None
+        self.good_metadata = None
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization"""
+        """
+        Convert to dictionary for JSON serialization
+        
+        Timestamps stay datetime objects - orjson and FastAPI's encoder write them
+        as ISO 8601 themselves. Use to_dict_stringified() for stdlib json.
+        """
         return {
             "name": self.name,
             "type": self.component_type,
             "status": self.status,
-            "last_check": self.last_check.isoformat() if self.last_check else None,
-            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_check": self.last_check,
+            "last_success": self.last_success,
             "error_message": self.error_message,
             "response_time_ms": self.response_time_ms,
-            "metadata": self.metadata
+            "metadata": self.metadata,
+            "consecutive_failures": self.consecutive_failures,
+            "last_good": self.last_good
         }
+    
+    def to_dict_stringified(self) -> Dict:
+        """Same as to_dict, with timestamps already converted to ISO 8601 strings"""
+        status_dict = self.to_dict()
+        status_dict["last_check"] = self.last_check.isoformat() if self.last_check else None
+        status_dict["last_success"] = self.last_success.isoformat() if self.last_success else None
+        return status_dict
 
 
-class ComponentMonitor:
-    """Monitor and track health of all VERDICT verification components"""
+class HealthChecker(ABC):
+    """
+    Health probe for a single component
     
-    def __init__(self, cmc_api=None, ftso_feed=None, flare_verifier=None):
+    Subclasses set the class attributes and implement check(). The per-component
+    policies (TTL, timeout, circuit breaker, stale fallback) live here and are
+    applied by HealthCheckCoordinator around each check() call.
+    """
+    
+    # Component identifier, display name and type (see ComponentStatus)
+    key: str
+    name: str
+    component_type: str
+    # Prefix of failure messages, e.g. "FTSO check failed: ..."
+    label: str
+    
+    # True if the probe result depends on the token (e.g. a price) - statuses
+    # are then cached per token, so one token's result is never served for another
+    per_token: bool = False
+    # Most tokens with a cached status (per_token checkers)
+    max_tokens: int = 64
+    
+    # Seconds a probe result is reused before the component is probed again
+    ttl_s: float = 10
+    # A stuck probe can't hold up check_all longer than this
+    timeout_s: float = 5
+    # A failed probe always sets status "error"; the last healthy metadata is
+    # reported separately (last_good, flagged stale) for this long after the
+    # last success
+    stale_max_age_s: float = 300
+    # Circuit breaker: after this many consecutive failed probes the component
+    # is not probed again for circuit_open_s (its last status is served instead)
+    failure_threshold: int = 3
+    circuit_open_s: float = 30
+    
+    def __init__(self):
+        # Latest status reported for the component, and the status per token
+        # ("" for checkers that don't depend on the token)
+        self.component = ComponentStatus(self.name, self.component_type)
+        self._statuses: Dict[str, ComponentStatus] = {}
+        if not self.per_token:
+            self._statuses[""] = self.component
+        # Monotonic time of the last probe per token, and until which the circuit stays open
+        self._checked_at: Dict[str, float] = {}
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+    
+    @abstractmethod
+    async def check(self, token: str, component: ComponentStatus) -> None:
         """
-        Initialize the component monitor
+        Probe the component and update its status
         
         Args:
-            cmc_api: CoinMarketCapAPI instance (optional)
-            ftso_feed: FTSOPriceFeed instance (optional)
-            flare_verifier: FlareVerifier instance (optional)
-        """
-        self.cmc_api = cmc_api
-        self.ftso_feed = ftso_feed
-        self.flare_verifier = flare_verifier
+            token: Token symbol to probe with (ignored by checkers that don't need one)
+            component: Status to update (see status_for)
         
-        # Component status tracking
-        self.components = {
-            "ftso_price_feed": ComponentStatus("FTSO Price Feed", "oracle"),
-            "cmc_api": ComponentStatus("CMC API", "data_provider"),
-            "fdc_endpoint": ComponentStatus("FDC Endpoint", "attestation"),
-            "contract_log": ComponentStatus("Contract Log", "blockchain")
-        }
+        Raises:
+            Exception: Any error is recorded as a failed probe by the coordinator
+        """
+    
+    def _token_key(self, token: str) -> str:
+        return token.upper() if self.per_token else ""
+    
+    def status_for(self, token: str) -> ComponentStatus:
+        """
+        Status for token (one shared status unless per_token), which also becomes
+        the component's latest status
+        """
+        key = self._token_key(token)
+        status = self._statuses.get(key)
+        if status is None:
+            if len(self._statuses) >= self.max_tokens:
+                oldest = next(iter(self._statuses))
+                del self._statuses[oldest]
+                self._checked_at.pop(oldest, None)
+            status = self._statuses[key] = ComponentStatus(self.name, self.component_type)
+        self.component = status
+        return status
+    
+    def is_fresh(self, token: str) -> bool:
+        """
+        Check if the last status for token can be reused without probing
         
-        # Status history (keep last 100 status updates per component)
-        self.status_history: Dict[str, List[Dict]] = {
-            key: [] for key in self.components.keys()
-        }
+        True while that status is within its TTL, or while the circuit is open
+        (for a token probed before); otherwise a new probe is stamped and False
+        is returned.
+        """
+        key = self._token_key(token)
+        now = time.monotonic()
+        checked_at = self._checked_at.get(key)
+        if checked_at is not None and (now < self._circuit_open_until or now - checked_at < self.ttl_s):
+            return True
+        self._checked_at[key] = now
+        return False
     
-    async def check_ftso_health(self, token: str = "BTC") -> ComponentStatus:
+    def mark_healthy(self, component: ComponentStatus, metadata: Dict):
+        """Record a successful probe and close the circuit"""
+        component.status = "healthy"
+        component.last_success = datetime.now()
+        component.error_message = None
+        component.metadata = metadata
+        component.good_metadata = metadata
+        component.last_good = None
+        component.consecutive_failures = 0
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+    
+    def record_failure(self, component: ComponentStatus, message: str):
         """
-        Check FTSO price feed health
+        Record a failed probe
         
-        Args:
-            token: Token symbol to check (default: BTC)
-            
-        Returns:
-            ComponentStatus for FTSO price feed
+        The status becomes "error" with empty metadata. If the component was
+        healthy recently, its last good metadata is reported in last_good
+        (flagged stale=True) so clients can still show it, marked as such.
         """
-        component = self.components["ftso_price_feed"]
-        component.last_check = datetime.now()
+        component.status = "error"
+        component.error_message = message
+        component.metadata = {}
+        self._consecutive_failures += 1
+        component.consecutive_failures = self._consecutive_failures
+        if self._consecutive_failures >= self.failure_threshold:
+            self._circuit_open_until = time.monotonic() + self.circuit_open_s
         
+        if (component.good_metadata is not None and component.last_success
+                and (datetime.now() - component.last_success).total_seconds() < self.stale_max_age_s):
+            component.last_good = {**component.good_metadata, "stale": True}
+        else:
+            component.last_good = None
+
+
+class FtsoHealthChecker(HealthChecker):
+    """FTSO price feed - fetches a price through the feed"""
+    
+    key = "ftso_price_feed"
+    name = "FTSO Price Feed"
+    component_type = "oracle"
+    label = "FTSO"
+    per_token = True
+    ttl_s = 10
+    
+    def __init__(self, ftso_feed=None):
+        super().__init__()
+        self.ftso_feed = ftso_feed
+    
+    async def check(self, token: str, component: ComponentStatus) -> None:
         if not self.ftso_feed:
             component.status = "offline"
             component.error_message = "FTSO feed not initialized"
-            return component
+            return
         
-        try:
-            start_time = datetime.now()
-            price_result = await self.ftso_feed.get_price(token)
-            response_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            component.response_time_ms = round(response_time, 2)
-            
-            if price_result and price_result.price > 0:
-                component.status = "healthy"
-                component.last_success = datetime.now()
-                component.error_message = None
-                component.metadata = {
-                    "price": price_result.price,
-                    "token": token,
-                    "timestamp": price_result.timestamp
-                }
-            else:
-                component.status = "warning"
-                component.error_message = "FTSO returned invalid price ($0)"
-                
-        except Exception as e:
-            component.status = "error"
-            component.error_message = f"FTSO check failed: {str(e)[:100]}"
-            logger.error(f"[ComponentMonitor] FTSO health check failed: {e}")
+        start_ns = time.perf_counter_ns()
+        price_result = await self.ftso_feed.get_price(token)
+        component.response_time_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
         
-        # Add to history
-        self._add_to_history("ftso_price_feed", component.to_dict())
-        return component
+        if price_result and price_result.price > 0:
+            self.mark_healthy(component, {
+                "price": price_result.price,
+                "token": token,
+                "timestamp": price_result.timestamp
+            })
+        else:
+            component.status = "warning"
+            component.error_message = "FTSO returned invalid price ($0)"
+
+
+class CmcHealthChecker(HealthChecker):
+    """CoinMarketCap API - fetches token info (blocking client, run in a worker thread)"""
     
-    def check_cmc_health(self, token: str = "BTC") -> ComponentStatus:
-        """
-        Check CoinMarketCap API health
-        
-        Args:
-            token: Token symbol to check (default: BTC)
-            
-        Returns:
-            ComponentStatus for CMC API
-        """
-        component = self.components["cmc_api"]
-        component.last_check = datetime.now()
-        
+    key = "cmc_api"
+    name = "CMC API"
+    component_type = "data_provider"
+    label = "CMC API"
+    per_token = True
+    ttl_s = 30
+    
+    def __init__(self, cmc_api=None):
+        super().__init__()
+        self.cmc_api = cmc_api
+    
+    async def check(self, token: str, component: ComponentStatus) -> None:
         if not self.cmc_api:
             component.status = "offline"
             component.error_message = "CMC API not initialized"
-            return component
+            return
         
-        try:
-            start_time = datetime.now()
-            market_data = self.cmc_api.get_token_info(token)
-            response_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            component.response_time_ms = round(response_time, 2)
+        start_ns = time.perf_counter_ns()
+        market_data = await asyncio.to_thread(self.cmc_api.get_token_info, token)
+        component.response_time_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
+        
+        if market_data and 'price' in market_data:
+            self.mark_healthy(component, {
+                "price": market_data['price'],
+                "token": token,
+                "api_credits_used": market_data.get('credits_used', 'N/A')
+            })
+        else:
+            component.status = "error"
+            component.error_message = "CMC API returned invalid data"
+
+
+class FdcHealthChecker(HealthChecker):
+    """FDC (Flare Data Connector) endpoint - checks the Flare RPC connection"""
+    
+    key = "fdc_endpoint"
+    name = "FDC Endpoint"
+    component_type = "attestation"
+    label = "FDC"
+    ttl_s = 15
+    
+    def __init__(self, flare_verifier=None):
+        super().__init__()
+        self.flare_verifier = flare_verifier
+    
+    async def check(self, token: str, component: ComponentStatus) -> None:
+        # For now, we simulate FDC status
+        # In production, this would check actual FDC attestation availability
+        if self.flare_verifier and hasattr(self.flare_verifier, 'w3'):
+            # web3's HTTPProvider is blocking, so the connection check runs in a worker thread
+            start_ns = time.perf_counter_ns()
+            connected = await asyncio.to_thread(self.flare_verifier.w3.is_connected)
+            component.response_time_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
             
-            if market_data and 'price' in market_data:
-                component.status = "healthy"
-                component.last_success = datetime.now()
-                component.error_message = None
-                component.metadata = {
-                    "price": market_data['price'],
-                    "token": token,
-                    "api_credits_used": market_data.get('credits_used', 'N/A')
-                }
+            if connected:
+                self.mark_healthy(component, {
+                    "network": "Coston2",
+                    "connected": True
+                })
             else:
-                component.status = "error"
-                component.error_message = "CMC API returned invalid data"
-                
-        except Exception as e:
-            component.status = "error"
-            component.error_message = f"CMC API check failed: {str(e)[:100]}"
-            logger.error(f"[ComponentMonitor] CMC health check failed: {e}")
+                component.status = "offline"
+                component.error_message = "Cannot connect to Flare network"
+        else:
+            component.status = "warning"
+            component.error_message = "FDC verification not fully configured"
+
+
+class ContractHealthChecker(HealthChecker):
+    """Smart contract verification system - only inspects local verifier state"""
+    
+    key = "contract_log"
+    name = "Contract Log"
+    component_type = "blockchain"
+    label = "Contract"
+    ttl_s = 30
+    
+    def __init__(self, flare_verifier=None):
+        super().__init__()
+        self.flare_verifier = flare_verifier
+    
+    async def check(self, token: str, component: ComponentStatus) -> None:
+        if not self.flare_verifier:
+            component.status = "offline"
+            component.error_message = "Contract verifier not initialized"
+            return
         
-        # Add to history
-        self._add_to_history("cmc_api", component.to_dict())
-        return component
+        # Check contract connection
+        if hasattr(self.flare_verifier, 'contract') and self.flare_verifier.contract:
+            self.mark_healthy(component, {
+                "contract_address": self.flare_verifier.contract_address,
+                "network": "Coston2"
+            })
+        else:
+            component.status = "warning"
+            component.error_message = "Contract not deployed or configured"
+
+
+class HealthCheckCoordinator:
+    """Runs registered HealthCheckers concurrently and aggregates their statuses"""
     
-    def check_fdc_health(self) -> ComponentStatus:
+    def __init__(self, checkers: Iterable[HealthChecker] = ()):
         """
-        Check FDC (Flare Data Connector) endpoint health
-        
-        Returns:
-            ComponentStatus for FDC endpoint
+        Args:
+            checkers: Checkers to register (see register())
         """
-        component = self.components["fdc_endpoint"]
-        component.last_check = datetime.now()
+        self.checkers: Dict[str, HealthChecker] = {}
         
-        # For now, we simulate FDC status
-        # In production, this would check actual FDC attestation availability
-        try:
-            # Check if we can reach the Flare network
-            if self.flare_verifier and hasattr(self.flare_verifier, 'w3'):
-                if self.flare_verifier.w3.is_connected():
-                    component.status = "healthy"
-                    component.last_success = datetime.now()
-                    component.error_message = None
-                    component.metadata = {
-                        "network": "Coston2",
-                        "connected": True
-                    }
-                else:
-                    component.status = "offline"
-                    component.error_message = "Cannot connect to Flare network"
-            else:
-                component.status = "warning"
-                component.error_message = "FDC verification not fully configured"
-                
-        except Exception as e:
-            component.status = "error"
-            component.error_message = f"FDC check failed: {str(e)[:100]}"
-            logger.error(f"[ComponentMonitor] FDC health check failed: {e}")
+        # Status history (keep last 100 status updates per component)
+        self.status_history: Dict[str, Deque[Dict]] = {}
         
-        # Add to history
-        self._add_to_history("fdc_endpoint", component.to_dict())
-        return component
+        # (status, error, response bucket) of the latest history entry per component
+        self._history_signatures: Dict[str, tuple] = {}
+        
+        for checker in checkers:
+            self.register(checker)
     
-    def check_contract_health(self) -> ComponentStatus:
+    def register(self, checker: HealthChecker):
         """
-        Check smart contract verification system health
+        Add a component to monitor
         
-        Returns:
-            ComponentStatus for contract log
+        Args:
+            checker: HealthChecker for the component (replaces one with the same key)
         """
-        component = self.components["contract_log"]
-        component.last_check = datetime.now()
+        self.checkers[checker.key] = checker
+        self.status_history.setdefault(checker.key, deque(maxlen=100))
+    
+    @property
+    def components(self) -> Dict[str, ComponentStatus]:
+        """Current status of every registered component"""
+        return {key: checker.component for key, checker in self.checkers.items()}
+    
+    async def run_check(self, component_key: str, token: str = "BTC") -> ComponentStatus:
+        """
+        Check a single component
         
-        if not self.flare_verifier:
-            component.status = "offline"
-            component.error_message = "Contract verifier not initialized"
+        Args:
+            component_key: Component identifier
+            token: Token symbol to check (default: BTC)
+            
+        Returns:
+            ComponentStatus for the component
+        """
+        return await self._cached_check(self.checkers[component_key], token)
+    
+    async def _cached_check(self, checker: HealthChecker, token: str) -> ComponentStatus:
+        """Run a checker unless its last status is still fresh, recording failures and history"""
+        component = checker.status_for(token)
+        if checker.is_fresh(token):
             return component
+        component.last_check = datetime.now()
         
         try:
-            # Check contract connection
-            if hasattr(self.flare_verifier, 'contract') and self.flare_verifier.contract:
-                component.status = "healthy"
-                component.last_success = datetime.now()
-                component.error_message = None
-                component.metadata = {
-                    "contract_address": self.flare_verifier.contract_address,
-                    "network": "Coston2"
-                }
-            else:
-                component.status = "warning"
-                component.error_message = "Contract not deployed or configured"
-                
+            await asyncio.wait_for(checker.check(token, component), checker.timeout_s)
+        except asyncio.TimeoutError:
+            checker.record_failure(component, f"Health check timed out after {checker.timeout_s}s")
+            logger.error(f"[ComponentMonitor] {checker.name} health check failed: {component.error_message}")
         except Exception as e:
-            component.status = "error"
-            component.error_message = f"Contract check failed: {str(e)[:100]}"
-            logger.error(f"[ComponentMonitor] Contract health check failed: {e}")
+            checker.record_failure(component, f"{checker.label} check failed: {str(e)[:100]}")
+            logger.error(f"[ComponentMonitor] {checker.name} health check failed: {e}")
         
         # Add to history
-        self._add_to_history("contract_log", component.to_dict())
+        self._add_to_history(checker.key, component)
         return component
     
-    async def check_all_components(self, token: str = "BTC") -> Dict[str, Dict]:
+    async def check_all(self, token: str = "BTC") -> Dict[str, Dict]:
         """
-        Check health of all components
+        Check every registered component concurrently
         
         Args:
             token: Token symbol to check (default: BTC)
@@ -247,83 +406,104 @@ class ComponentMonitor:
         Returns:
             Dictionary of all component statuses
         """
-        logger.info(f"[ComponentMonitor] Checking all components for {token}")
-        
-        # Check all components
-        await self.check_ftso_health(token)
-        self.check_cmc_health(token)
-        self.check_fdc_health()
-        self.check_contract_health()
+        statuses = await asyncio.gather(*(self._cached_check(checker, token)
+                                          for checker in self.checkers.values()))
         
         # Calculate overall health
-        overall_status = self._calculate_overall_status()
+        counts, avg_response_time = self._tally_components(statuses)
+        overall_status = self._calculate_overall_status(counts)
         
-        result = {
+        return {
             "components": {
-                key: comp.to_dict() for key, comp in self.components.items()
+                key: status.to_dict() for key, status in zip(self.checkers, statuses)
             },
             "overall": overall_status,
-            "timestamp": datetime.now().isoformat(),
-            "summary": self._generate_summary()
+            "timestamp": datetime.now(),
+            "summary": self._generate_summary(counts, avg_response_time)
         }
+    
+    def _tally_components(self, statuses: Iterable[ComponentStatus]) -> Tuple[Dict[str, int], Optional[float]]:
+        """
+        Count component statuses and average response times in one pass
         
-        return result
+        Args:
+            statuses: Status of each component
+        
+        Returns:
+            Tuple of (count per status, average response time in ms or None)
+        """
+        counts = {"healthy": 0, "warning": 0, "error": 0, "offline": 0}
+        response_time_sum = 0.0
+        response_time_count = 0
+        for comp in statuses:
+            counts[comp.status] = counts.get(comp.status, 0) + 1
+            if comp.response_time_ms is not None:
+                response_time_sum += comp.response_time_ms
+                response_time_count += 1
+        
+        avg_response_time = (
+            round(response_time_sum / response_time_count, 2) if response_time_count else None
+        )
+        return counts, avg_response_time
     
-    def _calculate_overall_status(self) -> str:
+    def _calculate_overall_status(self, counts: Dict[str, int]) -> str:
         """
         Calculate overall system health based on component statuses
         
+        Args:
+            counts: Count per status from _tally_components
+        
         Returns:
             Overall status: healthy, degraded, critical, offline
         """
-        statuses = [comp.status for comp in self.components.values()]
-        
-        if all(s == "healthy" for s in statuses):
+        if counts["healthy"] == len(self.checkers):
             return "healthy"
-        elif any(s == "offline" or s == "error" for s in statuses):
+        elif counts["offline"] + counts["error"] > 0:
             # If any critical component is offline, system is critical
             return "critical"
-        elif any(s == "warning" for s in statuses):
+        elif counts["warning"] > 0:
             return "degraded"
         else:
             return "unknown"
     
-    def _generate_summary(self) -> Dict:
+    def _generate_summary(self, counts: Dict[str, int], avg_response_time: Optional[float]) -> Dict:
         """
         Generate summary statistics
         
+        Args:
+            counts: Count per status from _tally_components
+            avg_response_time: Average response time from _tally_components
+        
         Returns:
             Summary dictionary with counts and averages
         """
-        statuses = [comp.status for comp in self.components.values()]
-        
         return {
-            "total_components": len(self.components),
-            "healthy": sum(1 for s in statuses if s == "healthy"),
-            "warning": sum(1 for s in statuses if s == "warning"),
-            "error": sum(1 for s in statuses if s == "error" or s == "offline"),
-            "avg_response_time_ms": self._calculate_avg_response_time()
+            "total_components": len(self.checkers),
+            "healthy": counts["healthy"],
+            "warning": counts["warning"],
+            "error": counts["error"] + counts["offline"],
+            "avg_response_time_ms": avg_response_time
         }
     
-    def _calculate_avg_response_time(self) -> Optional[float]:
-        """Calculate average response time across all components"""
-        times = [
-            comp.response_time_ms 
-            for comp in self.components.values() 
-            if comp.response_time_ms is not None
-        ]
+    def _add_to_history(self, component_key: str, component: ComponentStatus):
+        """
+        Add status to component history if it changed
         
-        if times:
-            return round(sum(times) / len(times), 2)
-        return None
-    
-    def _add_to_history(self, component_key: str, status_dict: Dict):
-        """Add status to component history"""
+        Only transitions are recorded: an entry whose status, error message and
+        response time (in 10 ms buckets) match the previous one is skipped
+        without serializing the component.
+        """
         if component_key in self.status_history:
-            self.status_history[component_key].append(status_dict)
-            # Keep only last 100 entries
-            if len(self.status_history[component_key]) > 100:
-                self.status_history[component_key] = self.status_history[component_key][-100:]
+            response_bucket = (
+                None if component.response_time_ms is None else int(component.response_time_ms // 10)
+            )
+            signature = (component.status, component.error_message, response_bucket)
+            if self._history_signatures.get(component_key) == signature:
+                return
+            self._history_signatures[component_key] = signature
+            
+            # Ring buffer - the oldest entry is dropped once 100 are stored
+            self.status_history[component_key].append(component.to_dict())
     
     def get_component_history(self, component_key: str, limit: int = 10) -> List[Dict]:
         """
@@ -337,5 +517,83 @@ class ComponentMonitor:
             List of status dictionaries
         """
         if component_key in self.status_history:
-            return self.status_history[component_key][-limit:]
+            history = self.status_history[component_key]
+            return list(islice(history, max(0, len(history) - limit), len(history)))
         return []
+
+
+class ComponentMonitor:
+    """Monitor and track health of all VERDICT verification components"""
+    
+    def __init__(self, cmc_api=None, ftso_feed=None, flare_verifier=None):
+        """
+        Initialize the component monitor
+        
+        Args:
+            cmc_api: CoinMarketCapAPI instance (optional)
+            ftso_feed: FTSOPriceFeed instance (optional)
+            flare_verifier: FlareVerifier instance (optional)
+        """
+        self.cmc_api = cmc_api
+        self.ftso_feed = ftso_feed
+        self.flare_verifier = flare_verifier
+        
+        # Further components can be added with coordinator.register()
+        self.coordinator = HealthCheckCoordinator([
+            FtsoHealthChecker(ftso_feed),
+            CmcHealthChecker(cmc_api),
+            FdcHealthChecker(flare_verifier),
+            ContractHealthChecker(flare_verifier)
+        ])
+    
+    @property
+    def components(self) -> Dict[str, ComponentStatus]:
+        """Current status of every monitored component"""
+        return self.coordinator.components
+    
+    @property
+    def status_history(self) -> Dict[str, Deque[Dict]]:
+        """Recent status entries per component"""
+        return self.coordinator.status_history
+    
+    async def check_ftso_health(self, token: str = "BTC") -> ComponentStatus:
+        """Check FTSO price feed health"""
+        return await self.coordinator.run_check("ftso_price_feed", token)
+    
+    async def check_cmc_health(self, token: str = "BTC") -> ComponentStatus:
+        """Check CoinMarketCap API health"""
+        return await self.coordinator.run_check("cmc_api", token)
+    
+    async def check_fdc_health(self) -> ComponentStatus:
+        """Check FDC (Flare Data Connector) endpoint health"""
+        return await self.coordinator.run_check("fdc_endpoint")
+    
+    async def check_contract_health(self) -> ComponentStatus:
+        """Check smart contract verification system health"""
+        return await self.coordinator.run_check("contract_log")
+    
+    async def check_all_components(self, token: str = "BTC") -> Dict[str, Dict]:
+        """
+        Check health of all components
+        
+        Args:
+            token: Token symbol to check (default: BTC)
+            
+        Returns:
+            Dictionary of all component statuses
+        """
+        logger.info(f"[ComponentMonitor] Checking all components for {token}")
+        return await self.coordinator.check_all(token)
+    
+    def get_component_history(self, component_key: str, limit: int = 10) -> List[Dict]:
+        """
+        Get recent history for a specific component
+        
+        Args:
+            component_key: Component identifier
+            limit: Number of recent entries to return
+            
+        Returns:
+            List of status dictionaries
+        """
+        return self.coordinator.get_component_history(component_key, limit)
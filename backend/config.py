@@ -36,6 +36,12 @@ CACHE_TTL_SECONDS = {
     "onchain": 60       # Cache on-chain data for 1 minute
 }
 
+# Sentiment micro-batching (concurrent requests share one Gemini call)
+SENTIMENT_BATCH = {
+    "max_batch_size": 8,
+    "max_latency_ms": 20
+}
+
 # Logging Configuration
 LOG_LEVEL = "INFO" if IS_PRODUCTION else "DEBUG"
 
@@ -2,8 +2,132 @@
 Decision engine that combines market data, sentiment, and on-chain signals
 to generate trading recommendations for perpetual DEX
 """
-from typing import Dict, Tuple
+from typing import Dict, NamedTuple, Sequence, Tuple
+from functools import lru_cache
 import json
+import numpy as np
+
+
+# Risk level encoding for the numeric scoring core (unknown levels score as Medium)
+RISK_INDEX = {'Low': 0, 'Medium': 1, 'High': 2}
+RISK_MULTIPLIERS = (1.2, 1.0, 0.7)
+RECOMMENDATIONS = ("HOLD", "LONG", "SHORT")
+LEVERAGE_WARNING = 'High leverage increases risk. Only use what you can afford to lose.'
+
+
+def _generate_reasoning(score: float, factors: list,
+                        price_change: float, risk: str) -> str:
+    """Generate human-readable reasoning for the recommendation"""
+    reasoning_parts = [
+        f"Overall signal score: {score:.2f}",
+        f"24h price change: {price_change:.2f}%",
+    ]
+    
+    if factors:
+        reasoning_parts.append(f"Key factors: {', '.join(factors[:3])}")
+    
+    reasoning_parts.append(f"Risk level: {risk}")
+    
+    return " | ".join(reasoning_parts)
+
+
+class Signal(NamedTuple):
+    """
+    Lightweight trading signal - the nested response dict is only built by to_dict()
+    
+    confidence is 0-1 and scores are unrounded; to_dict() applies the API rounding.
+    """
+    recommendation: str
+    confidence: float
+    final_score: float
+    sentiment_score: float
+    market_momentum: float
+    onchain_signal: float
+    risk_level: str
+    suggested_leverage: int
+    max_safe_leverage: int
+    price_change_24h: float
+    key_factors: list
+    
+    def to_dict(self) -> Dict:
+        """Materialize the calculate_signal() response dictionary"""
+        return {
+            'recommendation': self.recommendation,
+            'confidence': round(self.confidence * 100, 2),
+            'final_score': round(self.final_score, 2),
+            'signal_breakdown': {
+                'sentiment_score': round(self.sentiment_score, 2),
+                'market_momentum': round(self.market_momentum, 2),
+                'onchain_signal': round(self.onchain_signal, 2),
+                'risk_level': self.risk_level
+            },
+            'leverage_suggestion': {
+                'suggested_leverage': self.suggested_leverage,
+                'max_safe_leverage': self.max_safe_leverage,
+                'warning': LEVERAGE_WARNING
+            },
+            'reasoning': _generate_reasoning(self.final_score, self.key_factors,
+                                             self.price_change_24h, self.risk_level)
+        }
+
+
+def _calc_score(sentiment_score: float, short_term_sentiment: float,
+                price_change_24h: float, price_change_1h: float,
+                onchain_signal: float, risk_idx: int,
+                sentiment_weight: float, momentum_weight: float,
+                onchain_weight: float) -> Tuple[float, float, int, float]:
+    """
+    Numeric core of the signal calculation - plain floats in, plain floats out
+    
+    Returns:
+        Tuple of (final_score, market_momentum, recommendation_idx, confidence)
+        where recommendation_idx indexes RECOMMENDATIONS
+    """
+    # Market momentum score (amplified for better signals)
+    # Multiply by 1.5 to make price movements more impactful
+    market_momentum = ((price_change_24h * 0.6) + (price_change_1h * 0.4)) * 1.5
+    
+    # Calculate weighted final score
+    sentiment_component = (sentiment_score * 0.6 + short_term_sentiment * 0.4) * sentiment_weight
+    momentum_component = market_momentum * momentum_weight
+    onchain_component = onchain_signal * onchain_weight
+    
+    # Combine all signals
+    final_score = (sentiment_component + momentum_component + onchain_component) * RISK_MULTIPLIERS[risk_idx]
+    
+    # Determine recommendation (extremely sensitive - almost always shows signal)
+    # LONG: score > 0.5 (reduced from 3 to account for weighted calculation)
+    # SHORT: score < -0.5 (reduced from -3 to account for weighted calculation)
+    if final_score > 0.5:
+        return final_score, market_momentum, 1, min(abs(final_score) / 10, 1.0)
+    elif final_score < -0.5:
+        return final_score, market_momentum, 2, min(abs(final_score) / 10, 1.0)
+    return final_score, market_momentum, 0, 1.0 - (abs(final_score) / 0.5)
+
+
+@lru_cache(maxsize=512)
+def _leverage_core(confidence_band: int, risk_level: str) -> Tuple[int, int]:
+    """
+    Leverage for a confidence band (0: <=0.6, 1: <=0.8, 2: >0.8) and risk level
+    
+    Returns:
+        Tuple of (suggested_leverage, max_safe_leverage)
+    """
+    base_leverage = {
+        'Low': 10,
+        'Medium': 5,
+        'High': 2
+    }.get(risk_level, 5)
+    
+    # Adjust based on confidence
+    if confidence_band == 2:
+        suggested_leverage = min(base_leverage * 2, 20)
+    elif confidence_band == 1:
+        suggested_leverage = base_leverage
+    else:
+        suggested_leverage = max(base_leverage // 2, 1)
+    
+    return suggested_leverage, base_leverage * 2
 
 
 class DecisionEngine:
@@ -21,114 +145,92 @@ class DecisionEngine:
         """
         Calculate final trading signal by combining all inputs
         """
+        return self.score_signal(market_data, sentiment_data, onchain_data).to_dict()
+    
+    def score_signal(self, market_data: Dict, sentiment_data: Dict,
+                     onchain_data: Dict) -> Signal:
+        """
+        Same as calculate_signal, but returns a Signal tuple without building dicts
+        """
         # Extract key metrics
-        sentiment_score = sentiment_data.get('overall_sentiment', 0)
-        short_term_sentiment = sentiment_data.get('short_term_sentiment', 0)
-        risk_level = sentiment_data.get('risk_level', 'Medium')
-        
-        # Market momentum calculation (more sensitive)
+        sentiment_get = sentiment_data.get
+        sentiment_score = sentiment_get('overall_sentiment', 0)
+        risk_level = sentiment_get('risk_level', 'Medium')
         price_change_24h = market_data.get('percent_change_24h', 0)
-        price_change_1h = market_data.get('percent_change_1h', 0)
-        volume_24h = market_data.get('volume_24h', 0)
-        
-        # Normalize volume (assuming typical volume range)
-        volume_score = min(volume_24h / 10000000, 1.0) * 100  # Scale to 0-100
-        
-        # Market momentum score (amplified for better signals)
-        # Multiply by 1.5 to make price movements more impactful
-        market_momentum = ((price_change_24h * 0.6) + (price_change_1h * 0.4)) * 1.5
-        
-        # On-chain signal
         onchain_signal = onchain_data.get('onchain_signal', 0)
+        weights = self.weights
+        
+        final_score, market_momentum, recommendation_idx, confidence = _calc_score(
+            sentiment_score,
+            sentiment_get('short_term_sentiment', 0),
+            price_change_24h,
+            market_data.get('percent_change_1h', 0),
+            onchain_signal,
+            RISK_INDEX.get(risk_level, 1),
+            weights['sentiment'],
+            weights['market_momentum'],
+            weights['onchain']
+        )
         
-        # Risk adjustment
-        risk_multiplier = {
-            'Low': 1.2,
-            'Medium': 1.0,
-            'High': 0.7
-        }.get(risk_level, 1.0)
+        # Calculate position sizing suggestion (for perp DEX)
+        confidence_band = 2 if confidence > 0.8 else 1 if confidence > 0.6 else 0
+        suggested_leverage, max_safe_leverage = _leverage_core(confidence_band, risk_level)
+        
+        return Signal(
+            RECOMMENDATIONS[recommendation_idx],
+            confidence,
+            final_score,
+            sentiment_score,
+            market_momentum,
+            onchain_signal,
+            risk_level,
+            suggested_leverage,
+            max_safe_leverage,
+            price_change_24h,
+            sentiment_get('key_factors', [])
+        )
+    
+    def calculate_signals_batch(self, sentiment: Sequence[float], short_term_sentiment: Sequence[float],
+                                price_change_24h: Sequence[float], price_change_1h: Sequence[float],
+                                onchain_signal: Sequence[float], risk_level: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Score many tokens at once with NumPy (same math as calculate_signal)
+        
+        Args:
+            sentiment: Overall sentiment per token
+            short_term_sentiment: Short-term sentiment per token
+            price_change_24h: 24h price change % per token
+            price_change_1h: 1h price change % per token
+            onchain_signal: On-chain signal per token
+            risk_level: Risk level per token (Low/Medium/High)
+            
+        Returns:
+            Dictionary of arrays: recommendation, confidence (0-100), final_score, market_momentum
+        """
+        sentiment = np.asarray(sentiment, dtype=float)
+        short_term_sentiment = np.asarray(short_term_sentiment, dtype=float)
+        price_change_24h = np.asarray(price_change_24h, dtype=float)
+        price_change_1h = np.asarray(price_change_1h, dtype=float)
+        onchain_signal = np.asarray(onchain_signal, dtype=float)
+        risk_level = np.asarray(risk_level)
+        
+        risk_multiplier = np.where(risk_level == 'Low', 1.2, np.where(risk_level == 'High', 0.7, 1.0))
         
-        # Calculate weighted final score
-        sentiment_component = (sentiment_score * 0.6 + short_term_sentiment * 0.4) * self.weights['sentiment']
+        market_momentum = ((price_change_24h * 0.6) + (price_change_1h * 0.4)) * 1.5
+        sentiment_component = (sentiment * 0.6 + short_term_sentiment * 0.4) * self.weights['sentiment']
         momentum_component = market_momentum * self.weights['market_momentum']
         onchain_component = onchain_signal * self.weights['onchain']
-        
-        # Combine all signals
         final_score = (sentiment_component + momentum_component + onchain_component) * risk_multiplier
         
-        # Determine recommendation (extremely sensitive - almost always shows signal)
-        # LONG: score > 0.5 (reduced from 3 to account for weighted calculation)
-        # SHORT: score < -0.5 (reduced from -3 to account for weighted calculation)
-        if final_score > 0.5:
-            recommendation = "LONG"
-            confidence = min(abs(final_score) / 10, 1.0)  # Adjusted for new threshold
-        elif final_score < -0.5:
-            recommendation = "SHORT"
-            confidence = min(abs(final_score) / 10, 1.0)  # Adjusted for new threshold
-        else:
-            recommendation = "HOLD"
-            confidence = 1.0 - (abs(final_score) / 0.5)  # Adjusted for new threshold
-        
-        # Calculate position sizing suggestion (for perp DEX)
-        leverage_suggestion = self._suggest_leverage(confidence, risk_level)
+        is_long = final_score > 0.5
+        is_short = final_score < -0.5
+        abs_score = np.abs(final_score)
+        recommendation = np.where(is_long, "LONG", np.where(is_short, "SHORT", "HOLD"))
+        confidence = np.where(is_long | is_short, np.minimum(abs_score / 10, 1.0), 1.0 - abs_score / 0.5)
         
         return {
             'recommendation': recommendation,
-            'confidence': round(confidence * 100, 2),
-            'final_score': round(final_score, 2),
-            'signal_breakdown': {
-                'sentiment_score': round(sentiment_score, 2),
-                'market_momentum': round(market_momentum, 2),
-                'onchain_signal': round(onchain_signal, 2),
-                'risk_level': risk_level
-            },
-            'leverage_suggestion': leverage_suggestion,
-            'reasoning': self._generate_reasoning(recommendation, final_score, 
-                                                 sentiment_data, market_data, onchain_data)
-        }
-    
-    def _suggest_leverage(self, confidence: float, risk_level: str) -> Dict:
-        """
-        Suggest appropriate leverage based on confidence and risk
-        For perp DEX, leverage typically ranges from 1x to 100x+
-        """
-        base_leverage = {
-            'Low': 10,
-            'Medium': 5,
-            'High': 2
-        }.get(risk_level, 5)
-        
-        # Adjust based on confidence
-        if confidence > 0.8:
-            suggested_leverage = min(base_leverage * 2, 20)
-        elif confidence > 0.6:
-            suggested_leverage = base_leverage
-        else:
-            suggested_leverage = max(base_leverage // 2, 1)
-        
-        return {
-            'suggested_leverage': suggested_leverage,
-            'max_safe_leverage': base_leverage * 2,
-            'warning': 'High leverage increases risk. Only use what you can afford to lose.'
+            'confidence': np.round(confidence * 100, 2),
+            'final_score': np.round(final_score, 2),
+            'market_momentum': np.round(market_momentum, 2)
         }
-    
-    def _generate_reasoning(self, recommendation: str, score: float,
-                           sentiment_data: Dict, market_data: Dict, 
-                           onchain_data: Dict) -> str:
-        """Generate human-readable reasoning for the recommendation"""
-        factors = sentiment_data.get('key_factors', [])
-        price_change = market_data.get('percent_change_24h', 0)
-        
-        reasoning_parts = [
-            f"Overall signal score: {score:.2f}",
-            f"24h price change: {price_change:.2f}%",
-        ]
-        
-        if factors:
-            reasoning_parts.append(f"Key factors: {', '.join(factors[:3])}")
-        
-        risk = sentiment_data.get('risk_level', 'Medium')
-        reasoning_parts.append(f"Risk level: {risk}")
-        
-        return " | ".join(reasoning_parts)
-
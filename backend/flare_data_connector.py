@@ -3,15 +3,93 @@ Flare Data Connector (FDC) Integration
 Provides cryptographically verified data from external sources via Flare's oracle network
 """
 
+import asyncio
+import time
 import aiohttp
 import hashlib
-from typing import Dict, Optional, Any
+import orjson
+from typing import Dict, Optional, Any, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# One timeout policy for every FDC request
+FDC_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_connect=3, sock_read=10)
+
+# Payloads at least this large are hashed off the event loop
+HASH_OFFLOAD_BYTES = 64 * 1024
+
+# Application-wide session so all connectors reuse keep-alive connections to FDC
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_lock = asyncio.Lock()
+
+
+def _orjson_dumps_str(obj: Any) -> str:
+    """orjson serializer for aiohttp request bodies (which expects str)"""
+    return orjson.dumps(obj).decode()
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Get or create the application-wide FDC aiohttp session"""
+    global _shared_session
+    async with _shared_session_lock:
+        if _shared_session is None or _shared_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            _shared_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=FDC_TIMEOUT,
+                json_serialize=_orjson_dumps_str
+            )
+        return _shared_session
+
+
+async def close_shared_session():
+    """Close the application-wide FDC aiohttp session"""
+    global _shared_session
+    async with _shared_session_lock:
+        if _shared_session is not None:
+            await _shared_session.close()
+            _shared_session = None
+
+
+@dataclass(frozen=True)
+class Canonical:
+    """Canonical (sorted-key) JSON bytes of FDC content, serialized and hashed once"""
+    payload: bytes
+    digest: bytes
+    
+    @classmethod
+    def of(cls, content: Dict) -> "Canonical":
+        """
+        Serialize content and hash it
+        
+        hashlib's SHA-256 is backed by OpenSSL, which uses the CPU's SHA
+        extensions (SHA-NI) when available.
+        """
+        payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return cls(payload, hashlib.sha256(payload).digest())
+    
+    @classmethod
+    async def of_async(cls, content: Dict) -> "Canonical":
+        """
+        Same as of(), but large payloads are hashed in a worker thread
+        
+        hashlib releases the GIL for big buffers, so the price/sentiment/news
+        payloads gathered by fetch_all() hash in parallel instead of one after
+        another on the event loop.
+        """
+        payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        if len(payload) < HASH_OFFLOAD_BYTES:
+            return cls(payload, hashlib.sha256(payload).digest())
+        digest = await asyncio.to_thread(lambda: hashlib.sha256(payload).digest())
+        return cls(payload, digest)
+
 
 @dataclass
 class VerifiedData:
@@ -30,22 +108,214 @@ class FlareDataConnector:
     All data is cryptographically attested by Flare network
     """
     
-    def __init__(self, fdc_endpoint: str = "https://fdc-api.flare.network"):
+    # How long verified responses are reused, per data type
+    CACHE_TTL_SECONDS = {"price": 5, "sentiment": 30, "news": 60}
+    CACHE_MAX_ENTRIES = 1024
+    
+    # Source specification and VerifiedData.source_id per data type
+    REQUEST_SPECS = {
+        "price": {"source_type": "price_feed", "sources": ["coinmarketcap", "coingecko", "binance"]},
+        "sentiment": {"source_type": "sentiment_api", "sources": ["twitter", "reddit", "news_aggregator"]},
+        "news": {"source_type": "news_feed", "sources": ["cryptopanic", "newsapi"]},
+    }
+    SOURCE_IDS = {"price": "fdc_price_feed", "sentiment": "fdc_sentiment", "news": "fdc_news"}
+    
+    def __init__(self, fdc_endpoint: str = "https://fdc-api.flare.network",
+                 session: Optional[aiohttp.ClientSession] = None,
+                 batch_endpoint: bool = False):
+        """
+        Args:
+            fdc_endpoint: FDC API base URL
+            session: Optional aiohttp session to use (owned by the caller);
+                     defaults to the application-wide shared session
+            batch_endpoint: Whether fetch_batch() tries the /api/v1/batch endpoint;
+                            it isn't part of the documented FDC API, so it is off
+                            unless the deployment provides it
+        """
         self.fdc_endpoint = fdc_endpoint
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Cleared when the endpoint answers 404/405, so later batches skip it
+        self._batch_endpoint = batch_endpoint
+        
+        # {(symbol, kind): (expires_at, VerifiedData)} plus the FDC request in
+        # flight per key, so concurrent misses share it (dropped once it finishes)
+        self._cache: Dict[Tuple[str, str], Tuple[float, VerifiedData]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # {(content_digest, proof): verified} - skip re-validating repeated payloads
+        self._attestation_cache: Dict[Tuple[bytes, str], bool] = {}
+    
+    async def _get_cached(self, kind: str, symbol: str, fetch) -> VerifiedData:
+        """
+        Return cached verified data for (symbol, kind), fetching on miss
         
+        Args:
+            kind: Data type (price, sentiment, news)
+            symbol: Token symbol
+            fetch: Coroutine function performing the actual FDC request
+            
+        Returns:
+            VerifiedData (fallback results are returned but not cached)
+        """
+        cached = self._cached(kind, symbol)
+        if cached is not None:
+            return cached
+        
+        # Singleflight: a miss already being fetched is awaited, not requested again
+        key = (symbol, kind)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_and_store(kind, symbol, fetch))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so a cancelled caller doesn't cancel the request others are waiting on
+        return await asyncio.shield(inflight)
+    
+    async def _fetch_and_store(self, kind: str, symbol: str, fetch) -> VerifiedData:
+        """Uncached FDC request whose result is cached under (symbol, kind)"""
+        result = await fetch(symbol)
+        self._store(kind, symbol, result)
+        return result
+    
+    def _cached(self, kind: str, symbol: str) -> Optional[VerifiedData]:
+        """Fresh cached verified data for (symbol, kind), if any"""
+        cached = self._cache.get((symbol, kind))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+    
+    def _store(self, kind: str, symbol: str, result: VerifiedData):
+        """Cache verified data (fallback results are not cached)"""
+        if not result.source_id.endswith("_fallback"):
+            if len(self._cache) >= self.CACHE_MAX_ENTRIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[(symbol, kind)] = (time.monotonic() + self.CACHE_TTL_SECONDS[kind], result)
+    
+    def invalidate(self, symbol: str):
+        """Drop all cached FDC responses for a symbol (e.g. on a push update)"""
+        for key in [key for key in self._cache if key[0] == symbol]:
+            del self._cache[key]
+
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        """Get the aiohttp session (shared pooled session unless one was injected)"""
+        if self.session is None or self.session.closed:
+            self.session = await get_shared_session()
         return self.session
     
-    def _compute_hash(self, data: Dict) -> str:
-        """Compute hash of data for verification"""
-        data_str = str(sorted(data.items()))
-        return hashlib.sha256(data_str.encode()).hexdigest()
+    def _request_payload(self, kind: str, symbol: str) -> Dict:
+        """FDC request body for one data type"""
+        return {
+            "source_type": self.REQUEST_SPECS[kind]["source_type"],
+            "symbol": symbol,
+            "sources": self.REQUEST_SPECS[kind]["sources"],
+            "attestation_type": "evm"
+        }
+    
+    async def fetch_all(self, symbol: str) -> Tuple:
+        """
+        Fetch verified price, sentiment and news (cached where fresh)
+        
+        Whatever isn't cached is requested with a single fetch_batch() call.
+        
+        Args:
+            symbol: Token symbol (e.g., "BTC")
+            
+        Returns:
+            Tuple of (price, sentiment, news) VerifiedData
+        """
+        results = {kind: self._cached(kind, symbol) for kind in self.REQUEST_SPECS}
+        if any(result is None for result in results.values()):
+            for kind, result in (await self.fetch_batch(symbol)).items():
+                self._store(kind, symbol, result)
+                if results[kind] is None:
+                    results[kind] = result
+        return results["price"], results["sentiment"], results["news"]
+    
+    async def fetch_batch(self, symbol: str) -> Dict[str, VerifiedData]:
+        """
+        Get verified price, sentiment and news from FDC in one request
+        
+        Uses the per-type endpoints (concurrently) unless the batch endpoint
+        is enabled and available.
+        
+        Args:
+            symbol: Token symbol (e.g., "BTC")
+            
+        Returns:
+            Dictionary of data type -> VerifiedData
+        """
+        logger.info(f"[FDC] Requesting verified price, sentiment and news for {symbol}")
+        
+        if not self._batch_endpoint:
+            return await self._fetch_per_type(symbol)
+        
+        try:
+            session = await self._get_session()
+            
+            request_payload = {
+                "requests": [
+                    dict(self._request_payload(kind, symbol), kind=kind)
+                    for kind in self.REQUEST_SPECS
+                ]
+            }
+            
+            async with session.post(
+                f"{self.fdc_endpoint}/api/v1/batch",
+                json=request_payload
+            ) as response:
+                if response.status != 200:
+                    if response.status in (404, 405):
+                        # Not provided by this FDC deployment - stop trying it
+                        self._batch_endpoint = False
+                    logger.warning(f"[FDC] Batch request failed: {response.status}, using per-type requests")
+                    return await self._fetch_per_type(symbol)
+                
+                data = orjson.loads(await response.read())
+            
+            results = data.get("results", {})
+            verified_data = {}
+            for kind in self.REQUEST_SPECS:
+                entry = results.get(kind)
+                if not isinstance(entry, dict):
+                    verified_data[kind] = self._create_fallback_data(symbol, kind)
+                    continue
+                
+                content = entry.get("data", {})
+                proof = entry.get("attestation_proof")
+                content_hash, verified = await self._attest(content, proof)
+                
+                verified_data[kind] = VerifiedData(
+                    content=content,
+                    hash=content_hash,
+                    timestamp=int(time.time()),
+                    proof=proof,
+                    verified=verified,
+                    source_id=self.SOURCE_IDS[kind]
+                )
+            
+            verified_kinds = [kind for kind, result in verified_data.items() if result.verified]
+            logger.info(f"[FDC] Batch received - Verified: {verified_kinds}")
+            return verified_data
+            
+        except Exception as e:
+            logger.error(f"[FDC] Error fetching batch: {e}")
+            return {kind: self._create_fallback_data(symbol, kind) for kind in self.REQUEST_SPECS}
+    
+    async def _fetch_per_type(self, symbol: str) -> Dict[str, VerifiedData]:
+        """Fetch price, sentiment and news from their own endpoints, concurrently"""
+        price, sentiment, news = await asyncio.gather(
+            self._fetch_verified_price(symbol),
+            self._fetch_verified_sentiment(symbol),
+            self._fetch_verified_news(symbol)
+        )
+        return {"price": price, "sentiment": sentiment, "news": news}
     
     async def get_verified_price(self, symbol: str) -> VerifiedData:
+        """Get verified price data from FDC (cached for CACHE_TTL_SECONDS["price"])"""
+        return await self._get_cached("price", symbol, self._fetch_verified_price)
+    
+    async def _fetch_verified_price(self, symbol: str) -> VerifiedData:
         """
         Get verified price data from FDC
         
@@ -61,41 +331,35 @@ class FlareDataConnector:
             session = await self._get_session()
             
             # Request data from FDC with source specification
-            request_payload = {
-                "source_type": "price_feed",
-                "symbol": symbol,
-                "sources": ["coinmarketcap", "coingecko", "binance"],
-                "attestation_type": "evm"
-            }
+            request_payload = self._request_payload("price", symbol)
             
             async with session.post(
                 f"{self.fdc_endpoint}/api/v1/price",
-                json=request_payload,
-                timeout=10
+                json=request_payload
             ) as response:
                 if response.status != 200:
                     logger.error(f"[FDC] Price request failed: {response.status}")
                     # Return unverified fallback
                     return self._create_fallback_data(symbol, "price")
                 
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 
                 # Extract attestation proof
                 content = data.get("data", {})
                 proof = data.get("attestation_proof")
                 
                 # Validate proof
-                verified = self._validate_attestation(content, proof)
+                content_hash, verified = await self._attest(content, proof)
                 
                 logger.info(f"[FDC] Price received - Verified: {verified}")
                 
                 return VerifiedData(
                     content=content,
-                    hash=self._compute_hash(content),
-                    timestamp=int(datetime.now().timestamp()),
+                    hash=content_hash,
+                    timestamp=int(time.time()),
                     proof=proof,
                     verified=verified,
-                    source_id="fdc_price_feed"
+                    source_id=self.SOURCE_IDS["price"]
                 )
                 
         except Exception as e:
@@ -103,6 +367,10 @@ class FlareDataConnector:
             return self._create_fallback_data(symbol, "price")
     
     async def get_verified_sentiment(self, symbol: str) -> VerifiedData:
+        """Get verified sentiment data from FDC (cached for CACHE_TTL_SECONDS["sentiment"])"""
+        return await self._get_cached("sentiment", symbol, self._fetch_verified_sentiment)
+    
+    async def _fetch_verified_sentiment(self, symbol: str) -> VerifiedData:
         """
         Get verified sentiment data from FDC
         
@@ -117,37 +385,31 @@ class FlareDataConnector:
         try:
             session = await self._get_session()
             
-            request_payload = {
-                "source_type": "sentiment_api",
-                "symbol": symbol,
-                "sources": ["twitter", "reddit", "news_aggregator"],
-                "attestation_type": "evm"
-            }
+            request_payload = self._request_payload("sentiment", symbol)
             
             async with session.post(
                 f"{self.fdc_endpoint}/api/v1/sentiment",
-                json=request_payload,
-                timeout=15
+                json=request_payload
             ) as response:
                 if response.status != 200:
                     logger.error(f"[FDC] Sentiment request failed: {response.status}")
                     return self._create_fallback_data(symbol, "sentiment")
                 
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 content = data.get("data", {})
                 proof = data.get("attestation_proof")
                 
-                verified = self._validate_attestation(content, proof)
+                content_hash, verified = await self._attest(content, proof)
                 
                 logger.info(f"[FDC] Sentiment received - Verified: {verified}")
                 
                 return VerifiedData(
                     content=content,
-                    hash=self._compute_hash(content),
-                    timestamp=int(datetime.now().timestamp()),
+                    hash=content_hash,
+                    timestamp=int(time.time()),
                     proof=proof,
                     verified=verified,
-                    source_id="fdc_sentiment"
+                    source_id=self.SOURCE_IDS["sentiment"]
                 )
                 
         except Exception as e:
@@ -155,6 +417,10 @@ class FlareDataConnector:
             return self._create_fallback_data(symbol, "sentiment")
     
     async def get_verified_news(self, symbol: str) -> VerifiedData:
+        """Get verified news data from FDC (cached for CACHE_TTL_SECONDS["news"])"""
+        return await self._get_cached("news", symbol, self._fetch_verified_news)
+    
+    async def _fetch_verified_news(self, symbol: str) -> VerifiedData:
         """
         Get verified news data from FDC
         
@@ -169,74 +435,99 @@ class FlareDataConnector:
         try:
             session = await self._get_session()
             
-            request_payload = {
-                "source_type": "news_feed",
-                "symbol": symbol,
-                "sources": ["cryptopanic", "newsapi"],
-                "attestation_type": "evm"
-            }
+            request_payload = self._request_payload("news", symbol)
             
             async with session.post(
                 f"{self.fdc_endpoint}/api/v1/news",
-                json=request_payload,
-                timeout=15
+                json=request_payload
             ) as response:
                 if response.status != 200:
                     logger.error(f"[FDC] News request failed: {response.status}")
                     return self._create_fallback_data(symbol, "news")
                 
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 content = data.get("data", {})
                 proof = data.get("attestation_proof")
                 
-                verified = self._validate_attestation(content, proof)
+                content_hash, verified = await self._attest(content, proof)
                 
                 logger.info(f"[FDC] News received - Verified: {verified}")
                 
                 return VerifiedData(
                     content=content,
-                    hash=self._compute_hash(content),
-                    timestamp=int(datetime.now().timestamp()),
+                    hash=content_hash,
+                    timestamp=int(time.time()),
                     proof=proof,
                     verified=verified,
-                    source_id="fdc_news"
+                    source_id=self.SOURCE_IDS["news"]
                 )
                 
         except Exception as e:
             logger.error(f"[FDC] Error fetching news: {e}")
             return self._create_fallback_data(symbol, "news")
     
-    def _validate_attestation(self, data: Dict, proof: Optional[str]) -> bool:
+    async def _attest(self, content: Dict, proof: Optional[str]) -> Tuple[str, bool]:
         """
-        Validate FDC attestation proof
+        Hash content and validate its attestation proof
+        
+        The content is only serialized and hashed when the proof is well-formed;
+        a missing or malformed proof can never verify, so it costs no SHA-256.
         
         Args:
-            data: Data content to validate
+            content: Data content from FDC
             proof: Attestation proof from FDC
             
         Returns:
-            True if proof is valid, False otherwise
+            Tuple of (content hash hex, or "" when not hashed, verified)
         """
+        if not self._proof_wellformed(proof):
+            return "", False
+        
+        canon = await Canonical.of_async(content)
+        return canon.digest.hex(), self._proof_matches(canon, proof)
+    
+    @staticmethod
+    def _proof_wellformed(proof: Optional[str]) -> bool:
+        """Cheap format check of an attestation proof (no hashing)"""
         if not proof:
             logger.warning("[FDC] No attestation proof provided")
             return False
+        if not isinstance(proof, str) or len(proof) < 32:
+            logger.warning("[FDC] Malformed attestation proof")
+            return False
+        return True
+    
+    def _proof_matches(self, canon: Canonical, proof: str) -> bool:
+        """
+        Validate a well-formed FDC attestation proof against the content
         
-        try:
-            # Compute data hash
-            data_hash = self._compute_hash(data)
+        Args:
+            canon: Serialized and hashed data content
+            proof: Attestation proof from FDC
             
+        Returns:
+            True if proof is valid, False otherwise
+        """
+        cached = self._attestation_cache.get((canon.digest, proof))
+        if cached is not None:
+            return cached
+        
+        try:
             # In production, this would verify the cryptographic signature
             # against Flare's attestation provider contract
-            # For now, we validate proof format
-            
-            if len(proof) < 32:
-                return False
+            # For now, the format check in _proof_wellformed is all we validate
+            verified = True
             
             # TODO: Implement full EVM proof verification
             # This would call Flare's FDC verification contract
             
-            logger.info(f"[FDC] Attestation validated - Hash: {data_hash[:16]}...")
-            return True
+            if len(self._attestation_cache) >= self.CACHE_MAX_ENTRIES:
+                self._attestation_cache.clear()
+            self._attestation_cache[(canon.digest, proof)] = verified
+            
+            if verified:
+                logger.info(f"[FDC] Attestation validated - Hash: {canon.digest.hex()[:16]}...")
+            return verified
             
         except Exception as e:
             logger.error(f"[FDC] Attestation validation error: {e}")
@@ -247,14 +538,14 @@ class FlareDataConnector:
         return VerifiedData(
             content={"error": f"FDC {data_type} unavailable", "symbol": symbol},
             hash="",
-            timestamp=int(datetime.now().timestamp()),
+            timestamp=int(time.time()),
             proof=None,
             verified=False,
             source_id=f"fdc_{data_type}_fallback"
         )
     
     async def close(self):
-        """Close aiohttp session"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Close aiohttp session (injected sessions are left to their owner)"""
+        if self.session and self._owns_session:
+            await close_shared_session()
+        self.session = None
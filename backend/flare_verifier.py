@@ -4,12 +4,20 @@ Smart Contract interaction module for Flare VerifierContract
 
 from web3 import Web3
 from eth_account import Account
+from eth_abi import decode, encode
+import asyncio
 import json
 import os
+import threading
+import string
+import time
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 import logging
 from dotenv import load_dotenv
 
+from multicall import MULTICALL3_ABI, MULTICALL3_ADDRESS
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -51,15 +59,42 @@ VERIFIER_ABI = [
     }
 ]
 
+# 4-byte selectors of the view functions batched through Multicall3
+GET_STATISTICS_SELECTOR = Web3.keccak(text="getStatistics()")[:4]
+IS_DECISION_VALID_SELECTOR = Web3.keccak(text="isDecisionValid(bytes32)")[:4]
+
+HEX_DIGITS = frozenset(string.hexdigits)
+
+
+@lru_cache(maxsize=1024)
+def _keccak_text(text: str) -> bytes:
+    """keccak256 of a string (signals and proofs repeat, so memoized)"""
+    return Web3.keccak(text=text)
+
 
 class FlareVerifier:
     """Interact with VerifierContract on Flare Network"""
     
+    # Gas price is reused for this long instead of being queried per transaction
+    GAS_PRICE_TTL_SECONDS = 10
+    
+    # Coston2 blocks come every ~1.8s, so polling for the receipt faster than
+    # this only spends RPC calls
+    RECEIPT_TIMEOUT_SECONDS = 30
+    RECEIPT_POLL_SECONDS = 1.0
+    
     def __init__(self):
         self.rpc_url = os.getenv("FLARE_RPC_URL", "https://coston2-api.flare.network/ext/C/rpc")
         self.contract_address = os.getenv("VERIFIER_CONTRACT_ADDRESS")
         self.private_key = os.getenv("DEPLOYER_PRIVATE_KEY")
         
+        # Gas price cached between sends (see _current_gas_price)
+        self._gas_price: Optional[int] = None
+        self._gas_price_ts = 0.0
+        # Transactions are sent from worker threads; serialize nonce use
+        self._tx_lock = threading.Lock()
+        self.chain_id = int(os.getenv("FLARE_CHAIN_ID", "114"))
+        
         # Initialize Web3
         self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
         
@@ -83,6 +118,16 @@ class FlareVerifier:
                 address=Web3.to_checksum_address(self.contract_address),
                 abi=VERIFIER_ABI
             )
+            # Resolve the contract functions once instead of on every call
+            self._verify_fn = self.contract.get_function_by_signature(
+                'verifyDecision(string,string,bytes32,bytes32)'
+            )
+            self._is_valid_fn = self.contract.get_function_by_signature('isDecisionValid(bytes32)')
+            self._statistics_fn = self.contract.get_function_by_signature('getStatistics()')
+            self._aggregate3_fn = self.w3.eth.contract(
+                address=MULTICALL3_ADDRESS,
+                abi=MULTICALL3_ABI
+            ).get_function_by_name('aggregate3')
             logger.info(f"[Flare Verifier] Contract loaded: {self.contract_address}")
         else:
             self.contract = None
@@ -90,7 +135,36 @@ class FlareVerifier:
     
     def _string_to_bytes32(self, text: str) -> bytes:
         """Convert string to bytes32"""
-        return Web3.keccak(text=text)
+        return _keccak_text(text)
+    
+    def _to_bytes32(self, text: str) -> bytes:
+        """
+        Convert a hash or string to bytes32
+        
+        Values that already are 32-byte hex hashes (with or without 0x) are
+        decoded as-is; anything else is keccak-hashed.
+        """
+        hex_part = text[2:] if text.startswith("0x") else text
+        if len(hex_part) == 64 and HEX_DIGITS.issuperset(hex_part):
+            return bytes.fromhex(hex_part)
+        return self._string_to_bytes32(text)
+    
+    def _current_gas_price(self) -> int:
+        """Gas price, refreshed from the node at most every GAS_PRICE_TTL_SECONDS"""
+        now = time.monotonic()
+        if self._gas_price is None or now - self._gas_price_ts >= self.GAS_PRICE_TTL_SECONDS:
+            self._gas_price = self.w3.eth.gas_price
+            self._gas_price_ts = now
+        return self._gas_price
+    
+    def _next_nonce(self) -> int:
+        """
+        Nonce for the next transaction, read from the node's pending count
+        
+        Re-read on every send so transactions from other processes or
+        wallets using the same key do not leave a stale local counter.
+        """
+        return self.w3.eth.get_transaction_count(self.account.address, 'pending')
     
     async def verify_decision_on_chain(
         self,
@@ -119,32 +193,23 @@ class FlareVerifier:
             logger.info(f"[Flare Verifier] Verifying {symbol} {signal} on-chain...")
             
             # Convert hashes to bytes32
-            data_hash_bytes = self._string_to_bytes32(data_hash)
-            fdc_proof_bytes = self._string_to_bytes32(fdc_proof)
+            data_hash_bytes = self._to_bytes32(data_hash)
+            fdc_proof_bytes = self._to_bytes32(fdc_proof)
             
-            # Build transaction
-            tx = self.contract.functions.verifyDecision(
-                symbol,
-                signal,
-                data_hash_bytes,
-                fdc_proof_bytes
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 250000,
-                'gasPrice': self.w3.eth.gas_price,
-                'chainId': int(os.getenv("FLARE_CHAIN_ID", "114"))
-            })
-            
-            # Sign transaction
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # web3's HTTPProvider is blocking, so build/send and the receipt wait
+            # run in worker threads to keep the event loop free
+            tx_hash = await asyncio.to_thread(
+                self._send_verification, symbol, signal, data_hash_bytes, fdc_proof_bytes
+            )
             logger.info(f"[Flare Verifier] Transaction sent: {tx_hash.hex()}")
             
             # Wait for receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+            receipt = await asyncio.to_thread(
+                self.w3.eth.wait_for_transaction_receipt,
+                tx_hash,
+                self.RECEIPT_TIMEOUT_SECONDS,
+                self.RECEIPT_POLL_SECONDS
+            )
             
             # Parse logs to get decision ID and validity
             # This is simplified - in production, properly decode logs
@@ -160,6 +225,30 @@ class FlareVerifier:
             logger.error(f"[Flare Verifier] Error verifying on-chain: {e}")
             return (None, False)
     
+    def _send_verification(self, symbol: str, signal: str,
+                           data_hash_bytes: bytes, fdc_proof_bytes: bytes):
+        """Build, sign and send the verifyDecision transaction (blocking)"""
+        with self._tx_lock:
+            # Build transaction
+            tx = self._verify_fn(
+                symbol,
+                signal,
+                data_hash_bytes,
+                fdc_proof_bytes
+            ).build_transaction({
+                'from': self.account.address,
+                'nonce': self._next_nonce(),
+                'gas': 250000,
+                'gasPrice': self._current_gas_price(),
+                'chainId': self.chain_id
+            })
+            
+            # Sign transaction
+            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
+            
+            # Send transaction
+            return self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    
     async def check_decision_status(self, decision_id: str) -> bool:
         """
         Check if a decision is valid
@@ -175,7 +264,9 @@ class FlareVerifier:
         
         try:
             decision_id_bytes = bytes.fromhex(decision_id.replace('0x', ''))
-            is_valid = self.contract.functions.isDecisionValid(decision_id_bytes).call()
+            is_valid = await asyncio.to_thread(
+                self._is_valid_fn(decision_id_bytes).call
+            )
             return is_valid
         except Exception as e:
             logger.error(f"[Flare Verifier] Error checking status: {e}")
@@ -197,13 +288,53 @@ class FlareVerifier:
             }
         
         try:
-            stats = self.contract.functions.getStatistics().call()
-            return {
-                "total": stats[0],
-                "valid": stats[1],
-                "invalid": stats[2],
-                "success_rate": stats[3] / 100  # Convert from basis points to percentage
-            }
+            stats = await asyncio.to_thread(self._statistics_fn().call)
+            return self._format_statistics(stats)
         except Exception as e:
             logger.error(f"[Flare Verifier] Error getting statistics: {e}")
             return {"total": 0, "valid": 0, "invalid": 0, "success_rate": 0}
+    
+    async def get_statistics_with_status(self, decision_id: str) -> Tuple[Dict, bool]:
+        """
+        Get verification statistics and a decision's validity in one RPC call
+        
+        Both view calls are batched through Multicall3; if that fails they are
+        made separately.
+        
+        Args:
+            decision_id: Decision ID from verification
+            
+        Returns:
+            Tuple of (statistics dictionary as in get_statistics, is_valid)
+        """
+        if not self.contract:
+            return await self.get_statistics(), False
+        
+        try:
+            decision_id_bytes = bytes.fromhex(decision_id.replace('0x', ''))
+            target = self.contract.address
+            calls = [
+                (target, False, GET_STATISTICS_SELECTOR),
+                (target, False, IS_DECISION_VALID_SELECTOR + encode(['bytes32'], [decision_id_bytes]))
+            ]
+            (_, stats_data), (_, valid_data) = await asyncio.to_thread(self._aggregate3_fn(calls).call)
+            
+            stats = decode(['uint256', 'uint256', 'uint256', 'uint256'], stats_data)
+            (is_valid,) = decode(['bool'], valid_data)
+            return self._format_statistics(stats), is_valid
+        except Exception as e:
+            logger.warning(f"[Flare Verifier] Multicall failed, querying separately: {e}")
+            stats, is_valid = await asyncio.gather(
+                self.get_statistics(), self.check_decision_status(decision_id)
+            )
+            return stats, is_valid
+    
+    @staticmethod
+    def _format_statistics(stats) -> Dict:
+        """Convert getStatistics() output to the statistics dictionary"""
+        return {
+            "total": stats[0],
+            "valid": stats[1],
+            "invalid": stats[2],
+            "success_rate": stats[3] / 100  # Convert from basis points to percentage
+        }
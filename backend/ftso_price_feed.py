@@ -3,24 +3,49 @@ Flare Time Series Oracle (FTSO) Integration
 Provides decentralized price feeds from Flare network
 """
 
+import asyncio
+import time
 import aiohttp
 from typing import Dict, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, replace
 import logging
+from eth_abi import decode, encode
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+
+from multicall import MULTICALL3_ABI, MULTICALL3_ADDRESS
 
 logger = logging.getLogger(__name__)
 
+# Separate connect/read budgets within a 5s total for FTSO HTTP requests
+FTSO_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2, sock_read=3)
+
+# PriceReader ABI - simple and direct!
+PRICE_READER_ABI = [{
+    "inputs": [{"name": "_asset", "type": "uint256"}],
+    "name": "getCurrentPrice",
+    "outputs": [
+        {"name": "price", "type": "uint256"},
+        {"name": "timestamp", "type": "uint256"}
+    ],
+    "stateMutability": "view",
+    "type": "function"
+}]
+
+# 4-byte selector of PriceReader.getCurrentPrice(uint256), for Multicall3 batches
+GET_CURRENT_PRICE_SELECTOR = Web3.keccak(text="getCurrentPrice(uint256)")[:4]
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class FTSOPrice:
-    """Represents a price from FTSO with metadata"""
+    """Represents a price from FTSO with metadata (immutable, so cache entries can be shared)"""
     symbol: str
     price: float
     timestamp: int
     decimals: int
     provider: str
     confidence: float
+    # On-chain fixed-point value (price * 10**decimals), 0 for fallback prices
+    raw_price: int = 0
 
 
 class FTSOPriceFeed:
@@ -30,7 +55,8 @@ class FTSOPriceFeed:
     """
     
     # Flare PriceReader System Contract (Coston2) - THE authoritative source!
-    PRICE_READER_ADDRESS = "0x1000000000000000000000000000000000000003"
+    # (checksummed once here rather than on every contract construction)
+    PRICE_READER_ADDRESS = Web3.to_checksum_address("0x1000000000000000000000000000000000000003")
     
     # Asset IDs for FTSO feeds on Coston2
     ASSET_IDS = {
@@ -41,31 +67,96 @@ class FTSOPriceFeed:
         "ADA": 5,
         "FLR": 6,
     }
+    # Common spellings of each known pair -> base asset (see _base_symbol)
+    BASE_SYMBOLS = {
+        form: base
+        for base in ASSET_IDS
+        for form in (base, base.lower(), f"{base}/USD", f"{base.lower()}/usd", f"{base}USD", f"{base.lower()}usd")
+    }
+    
+    # Price cache TTLs (seconds): FTSO updates roughly every 3s; slow lookups
+    # are kept longer and fallback (failed) results only briefly
+    PRICE_CACHE_TTL = 3.0
+    SLOW_PRICE_CACHE_TTL = 10.0
+    SLOW_LOOKUP_SECONDS = 1.0
+    FALLBACK_CACHE_TTL = 1.0
+    # Symbols come from API callers, so the cache is bounded (oldest entry evicted)
+    PRICE_CACHE_MAX_ENTRIES = 1024
+    # After a failed connection attempt, lookups fall back immediately for
+    # this long instead of each retrying the (slow, timing-out) connection
+    INIT_RETRY_SECONDS = 5.0
     
     def __init__(
         self,
         rpc_url: str = "https://coston2-api.flare.network/ext/C/rpc",
-        network: str = "coston2"
+        network: str = "coston2",
+        max_concurrency: int = 8,
+        rpc_concurrency: int = 8
     ):
         self.rpc_url = rpc_url
         self.network = network
+        # Caps concurrent price lookups in get_multiple_prices
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Caps in-flight eth_calls against the (public, rate-limited) RPC endpoint
+        self._rpc_semaphore = asyncio.Semaphore(rpc_concurrency)
+        
+        # {normalized symbol: (expires_at, FTSOPrice)} plus the lookup in flight per
+        # symbol, so concurrent misses only query the chain once (dropped once it finishes)
+        self._price_cache: Dict[str, Tuple[float, FTSOPrice]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.session: Optional[aiohttp.ClientSession] = None
         self.w3 = None
         self.price_reader = None  # PriceReader contract
+        self.multicall = None  # Multicall3 contract (batched price reads)
+        # getCurrentPrice calldata per asset ID, encoded once instead of per call
+        self._price_calldata: Dict[int, bytes] = {
+            asset_id: GET_CURRENT_PRICE_SELECTOR + encode(["uint256"], [asset_id])
+            for asset_id in self.ASSET_IDS.values()
+        }
+        # Concurrent first lookups must not each build a Web3 connection
+        self._init_lock = asyncio.Lock()
+        # (retry_at, error) of the last failed _init_web3, or None
+        self._init_failure: Optional[Tuple[float, Exception]] = None
     
     async def _init_web3(self):
-        """Initialize Web3 connection and PriceReader contract"""
+        """
+        Initialize Web3 connection and PriceReader contract
+        
+        A failure is remembered for INIT_RETRY_SECONDS; calls in that window
+        re-raise it without trying to connect again.
+        """
+        if self.price_reader is not None:
+            return
+        async with self._init_lock:
+            if self.price_reader is not None:
+                return
+            if self._init_failure and self._init_failure[0] > time.monotonic():
+                raise self._init_failure[1]
+            try:
+                await self._init_web3_locked()
+            except Exception as e:
+                self._init_failure = (time.monotonic() + self.INIT_RETRY_SECONDS, e)
+                raise
+            self._init_failure = None
+    
+    async def _init_web3_locked(self):
+        """Body of _init_web3 (caller holds _init_lock)"""
         # STEP 1: Initialize Web3 if needed
         if self.w3 is None:
-            from web3 import Web3
-            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            # Async provider, so RPC calls don't block the event loop. It uses the
+            # pooled keep-alive session from _get_session instead of its own
+            provider = AsyncHTTPProvider(self.rpc_url, request_kwargs={"timeout": FTSO_TIMEOUT})
+            await provider.cache_async_session(await self._get_session())
+            w3 = AsyncWeb3(provider)
             
             # Verify connection
-            if not self.w3.is_connected():
+            if not await w3.is_connected():
+                await w3.provider.disconnect()
                 raise ConnectionError(f"Cannot connect to Flare RPC: {self.rpc_url}")
+            self.w3 = w3
             
             # Verify chain ID (Coston2 = 114)
-            chain_id = self.w3.eth.chain_id
+            chain_id = await self.w3.eth.chain_id
             if chain_id != 114:
                 logger.warning(f"[FTSO] Chain ID is {chain_id}, expected 114 for Coston2")
             
@@ -73,23 +164,14 @@ class FTSOPriceFeed:
         
         # STEP 2: Initialize PriceReader if needed
         if self.price_reader is None:
-            from web3 import Web3
-            
-            # PriceReader ABI - simple and direct!
-            price_reader_abi = [{
-                "inputs": [{"name": "_asset", "type": "uint256"}],
-                "name": "getCurrentPrice",
-                "outputs": [
-                    {"name": "price", "type": "uint256"},
-                    {"name": "timestamp", "type": "uint256"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            }]
-            
             self.price_reader = self.w3.eth.contract(
-                address=Web3.to_checksum_address(self.PRICE_READER_ADDRESS),
-                abi=price_reader_abi
+                address=self.PRICE_READER_ADDRESS,
+                abi=PRICE_READER_ABI
+            )
+            
+            self.multicall = self.w3.eth.contract(
+                address=MULTICALL3_ADDRESS,
+                abi=MULTICALL3_ABI
             )
             
             logger.info(f"[FTSO] ✅ PriceReader initialized at {self.PRICE_READER_ADDRESS}")
@@ -98,7 +180,7 @@ class FTSOPriceFeed:
         """Get price from PriceReader for a given symbol"""
         try:
             # Get asset ID
-            symbol_clean = symbol.upper().replace("/USD", "").replace("USD", "").strip()
+            symbol_clean = self._base_symbol(symbol)
             asset_id = self.ASSET_IDS.get(symbol_clean)
             
             if asset_id is None:
@@ -106,35 +188,170 @@ class FTSOPriceFeed:
             
             logger.info(f"[FTSO] Querying PriceReader for {symbol_clean} (Asset ID: {asset_id})")
             
-            # Call getCurrentPrice - returns (price, timestamp)
-            price_value, timestamp = self.price_reader.functions.getCurrentPrice(asset_id).call()
-            
-            # FTSO uses 5 decimals
-            real_price = float(price_value) / 100000
+            # Call getCurrentPrice - returns (price, timestamp). Raw eth_call with the
+            # pre-encoded calldata, skipping the ContractFunction build/encode per call
+            async with self._rpc_semaphore:
+                result = await self.w3.eth.call({
+                    "to": self.PRICE_READER_ADDRESS,
+                    "data": self._price_calldata[asset_id]
+                })
+            price_value, timestamp = decode(["uint256", "uint256"], result)
             
-            logger.info(f"[FTSO] ✅ REAL price from Flare validators: {symbol_clean} = ${real_price:,.2f} (ts: {timestamp})")
-            
-            return FTSOPrice(
-                symbol=symbol,
-                price=real_price,
-                timestamp=timestamp,
-                decimals=5,  # FTSO standard
-                provider="FTSO_PRICEREADER_COSTON2",
-                confidence=0.99
-            )
+            price = self._to_ftso_price(symbol, price_value, timestamp)
+            logger.info(f"[FTSO] ✅ REAL price from Flare validators: {symbol_clean} = ${price.price:,.2f} (ts: {timestamp})")
+            return price
             
         except Exception as e:
             logger.error(f"[FTSO] Error getting price for {symbol}: {e}")
             raise
     
+    @classmethod
+    def _base_symbol(cls, symbol: str) -> str:
+        """Base asset of a symbol (BTC, btc, BTC/USD, BTCUSD -> BTC)"""
+        base = cls.BASE_SYMBOLS.get(symbol)
+        if base is not None:
+            return base
+        return symbol.upper().replace("/USD", "").replace("USD", "").strip()
+    
+    @staticmethod
+    def _to_ftso_price(symbol: str, price_value: int, timestamp: int) -> FTSOPrice:
+        """Build an FTSOPrice from a raw getCurrentPrice result"""
+        return FTSOPrice(
+            symbol=symbol,
+            price=float(price_value) / 100000,  # FTSO uses 5 decimals
+            timestamp=timestamp,
+            decimals=5,  # FTSO standard
+            provider="FTSO_PRICEREADER_COSTON2",
+            confidence=0.99,
+            raw_price=price_value
+        )
+    
+    async def _prefetch_prices(self, symbols: list[str]):
+        """
+        Read the prices of uncached symbols in one Multicall3 call and cache them
+        
+        Symbols that are unknown, fail in the batch or are already cached are left
+        to get_price.
+        
+        Args:
+            symbols: Trading pairs to prefetch
+        """
+        now = time.monotonic()
+        pending: Dict[str, Tuple[str, int]] = {}  # normalized -> (symbol, asset ID)
+        for symbol in symbols:
+            normalized = self._normalize_symbol(symbol)
+            cached = self._price_cache.get(normalized)
+            if normalized in pending or (cached and cached[0] > now):
+                continue
+            asset_id = self.ASSET_IDS.get(self._base_symbol(symbol))
+            if asset_id is not None:
+                pending[normalized] = (symbol, asset_id)
+        
+        # A single symbol gains nothing from batching
+        if len(pending) < 2:
+            return
+        
+        target = self.price_reader.address
+        calls = [(target, True, self._price_calldata[asset_id]) for _, asset_id in pending.values()]
+        
+        start = time.monotonic()
+        async with self._rpc_semaphore:
+            results = await self.multicall.functions.aggregate3(calls).call()
+        elapsed = time.monotonic() - start
+        
+        expires_at = time.monotonic() + (
+            self.SLOW_PRICE_CACHE_TTL if elapsed > self.SLOW_LOOKUP_SECONDS else self.PRICE_CACHE_TTL
+        )
+        for (normalized, (symbol, _)), (success, data) in zip(pending.items(), results):
+            if success:
+                price_value, timestamp = decode(["uint256", "uint256"], data)
+                self._cache_price(normalized, expires_at, self._to_ftso_price(symbol, price_value, timestamp))
+        
+        logger.info(f"[FTSO] Batched {len(calls)} price reads into one Multicall3 call")
+    
+    async def warmup(self):
+        """
+        Connect and prime the price cache for every known asset in one batched call
+        
+        Meant for application startup, so the first requests don't pay for the
+        connection setup and per-symbol reads.
+        """
+        await self._init_web3()
+        await self._prefetch_prices(list(self.ASSET_IDS))
+    
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        """Get or create aiohttp session (pooled, keep-alive connections)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=FTSO_TIMEOUT)
+        return self.session
     
     async def get_price(self, symbol: str) -> FTSOPrice:
         """
-        Get REAL price from FTSO via FtsoRegistry (Phase 5 - FIXED)
+        Get REAL price from FTSO, reusing a recent lookup of the same pair
+        
+        Args:
+            symbol: Trading pair base (e.g., "BTC", "ETH")
+            
+        Returns:
+            FTSOPrice with actual validator price
+        """
+        normalized = self._normalize_symbol(symbol)
+        
+        cached = self._price_cache.get(normalized)
+        if cached and cached[0] > time.monotonic():
+            return replace(cached[1], symbol=symbol)
+        
+        # Singleflight: a lookup already in flight for the pair is awaited, not repeated
+        inflight = self._inflight.get(normalized)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_and_cache(normalized, symbol))
+            self._inflight[normalized] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(normalized, None))
+        
+        # Shielded so a cancelled caller doesn't cancel the lookup others are waiting on
+        price = await asyncio.shield(inflight)
+        return price if price.symbol == symbol else replace(price, symbol=symbol)
+    
+    async def _fetch_and_cache(self, normalized: str, symbol: str) -> FTSOPrice:
+        """Uncached lookup whose result is cached under normalized with an adaptive TTL"""
+        start = time.monotonic()
+        price = await self._fetch_price(symbol)
+        elapsed = time.monotonic() - start
+        
+        if price.provider == "FTSO_FALLBACK":
+            ttl = self.FALLBACK_CACHE_TTL
+        elif elapsed > self.SLOW_LOOKUP_SECONDS:
+            ttl = self.SLOW_PRICE_CACHE_TTL
+        else:
+            ttl = self.PRICE_CACHE_TTL
+        self._cache_price(normalized, time.monotonic() + ttl, price)
+        return price
+    
+    def _cache_price(self, normalized: str, expires_at: float, price: FTSOPrice):
+        """Store a price, evicting the oldest entry when the cache is full"""
+        self._price_cache.pop(normalized, None)
+        if len(self._price_cache) >= self.PRICE_CACHE_MAX_ENTRIES:
+            self._price_cache.pop(next(iter(self._price_cache)))
+        self._price_cache[normalized] = (expires_at, price)
+    
+    def invalidate(self, symbol: str):
+        """
+        Drop the cached price of a pair so the next lookup reads the chain
+        
+        Args:
+            symbol: Trading pair (any form accepted by get_price)
+        """
+        self._price_cache.pop(self._normalize_symbol(symbol), None)
+    
+    async def _fetch_price(self, symbol: str) -> FTSOPrice:
+        """
+        Get REAL price from FTSO via the PriceReader contract (Phase 5 - FIXED)
         
         Args:
             symbol: Trading pair base (e.g., "BTC", "ETH")
@@ -144,11 +361,16 @@ class FTSOPriceFeed:
         """
         logger.info(f"[FTSO] Requesting REAL price for {symbol}")
         
+        # Unknown assets fall back without paying for the Web3 connection
+        if self._base_symbol(symbol) not in self.ASSET_IDS:
+            logger.error(f"[FTSO] Error fetching REAL price: No asset ID for {self._base_symbol(symbol)}")
+            return self._create_fallback_price(symbol)
+        
         try:
-            # Initialize Web3 and FtsoRegistry if needed
+            # Initialize Web3 and PriceReader if needed
             await self._init_web3()
             
-            # Get price from FtsoRegistry
+            # Get price from PriceReader
             return await self._get_ftso_price(symbol)
             
         except Exception as e:
@@ -182,10 +404,12 @@ class FTSOPriceFeed:
         try:
             ftso_price = await self.get_price(symbol)
             
-            # Allow 1% deviation
-            deviation = abs(ftso_price.price - claimed_price) / ftso_price.price
+            # A mismatch may just be a stale cache entry - re-check against a fresh read
+            if not self._within_tolerance(ftso_price, claimed_price):
+                self.invalidate(symbol)
+                ftso_price = await self.get_price(symbol)
             
-            if deviation < 0.01:  # 1% tolerance
+            if self._within_tolerance(ftso_price, claimed_price):
                 logger.info(f"[FTSO] Price verification passed for {symbol}")
                 return True
             else:
@@ -199,6 +423,18 @@ class FTSOPriceFeed:
             logger.error(f"[FTSO] Price verification error: {e}")
             return False
     
+    @staticmethod
+    def _within_tolerance(ftso_price: FTSOPrice, claimed_price: float) -> bool:
+        """
+        Check a claimed price is within 1% of the FTSO price
+        
+        Compared on the integer fixed-point values, so there is no float
+        division (and no ZeroDivisionError for fallback prices).
+        """
+        raw = ftso_price.raw_price
+        claimed_raw = round(claimed_price * 10 ** ftso_price.decimals)
+        return abs(raw - claimed_raw) * 100 < raw
+    
     def _normalize_symbol(self, symbol: str) -> str:
         """
         Normalize symbol to FTSO format
@@ -223,7 +459,7 @@ class FTSOPriceFeed:
         return FTSOPrice(
             symbol=symbol,
             price=0.0,
-            timestamp=int(datetime.now().timestamp()),
+            timestamp=int(time.time()),
             decimals=2,
             provider="FTSO_FALLBACK",
             confidence=0.0
@@ -231,7 +467,7 @@ class FTSOPriceFeed:
     
     async def get_multiple_prices(self, symbols: list[str]) -> Dict[str, FTSOPrice]:
         """
-        Get prices for multiple symbols
+        Get prices for multiple symbols concurrently (at most max_concurrency at a time)
         
         Args:
             symbols: List of trading pairs
@@ -239,20 +475,37 @@ class FTSOPriceFeed:
         Returns:
             Dictionary mapping symbol to FTSOPrice
         """
-        results = {}
+        async def fetch(symbol: str) -> FTSOPrice:
+            async with self._semaphore:
+                return await self.get_price(symbol)
         
-        for symbol in symbols:
-            try:
-                price = await self.get_price(symbol)
-                results[symbol] = price
-            except Exception as e:
-                logger.error(f"[FTSO] Error fetching {symbol}: {e}")
-                results[symbol] = self._create_fallback_price(symbol)
+        # Connect once up front rather than racing the lazy init in every fetch,
+        # and read all uncached prices in one batched call - get_price then
+        # serves them from the cache
+        try:
+            await self._init_web3()
+            await self._prefetch_prices(symbols)
+        except Exception as e:
+            logger.error(f"[FTSO] Batched price lookup failed, fetching individually: {e}")
+        
+        prices = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        
+        results = dict.fromkeys(symbols)
+        for symbol, price in zip(symbols, prices):
+            if isinstance(price, Exception):
+                logger.error(f"[FTSO] Error fetching {symbol}: {price}")
+                price = self._create_fallback_price(symbol)
+            results[symbol] = price
         
         return results
     
     async def close(self):
-        """Close aiohttp session"""
+        """Close the Web3 provider and the shared aiohttp session"""
+        if self.w3 is not None:
+            await self.w3.provider.disconnect()
+            self.w3 = None
+            self.price_reader = None
+            self.multicall = None
         if self.session:
             await self.session.close()
             self.session = None
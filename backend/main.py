@@ -54,7 +54,7 @@ class PerpDEXAnalyzer:
         
         # Step 2: Analyze sentiment
         print("🤖 Analyzing sentiment with Gemini AI...")
-        sentiment_data = self.sentiment_analyzer.analyze_token_sentiment(
+        sentiment_data = self.sentiment_analyzer.analyze_token_sentiment_sync(
             token_symbol, 
             market_data['name'], 
             market_data
@@ -0,0 +1,363 @@
+"""
+Rule Condition Compiler for VERDICT
+Turns rule conditions into evaluators over a whitelisted subset of Python expressions
+"""
+
+import ast
+import sys
+import operator
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+
+# numba is optional - when installed, the simple-rule kernel is JIT-compiled
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# YAML-style literals, folded into constants when the rule is compiled
+LITERAL_NAMES = {
+    "true": True,
+    "True": True,
+    "false": False,
+    "False": False,
+    "null": None,
+    "None": None,
+}
+
+# Op codes of `feature OP number` rules in SimpleRuleBank (np.choose order)
+SIMPLE_OPS = {
+    ast.LtE: 0,
+    ast.Lt: 1,
+    ast.GtE: 2,
+    ast.Gt: 3,
+    ast.Eq: 4,
+    ast.NotEq: 5,
+}
+
+# Supported operators - anything else is rejected when the rule is loaded
+COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+class RuleEvaluator(ast.NodeVisitor):
+    """
+    Evaluator for a single rule condition
+    
+    The AST is walked once at construction and every node is turned into a small
+    closure, so run() only calls closures - no eval() frame setup and no access
+    to builtins, calls, subscripts or object attributes. Dotted names are looked
+    up as flattened keys (see RulesEngine._build_namespace).
+    """
+    
+    def __init__(self, tree: ast.AST):
+        """
+        Args:
+            tree: Parsed condition (ast.parse(condition, mode="eval"))
+        
+        Raises:
+            ValueError: If the condition uses an unsupported expression
+        """
+        # Namespace keys the condition reads (dotted keys for attribute chains)
+        self.referenced_names: Set[str] = set()
+        self._run: Callable[[Dict[str, Any]], Any] = self.visit(tree)
+        # (namespace key, op code, threshold) if the condition is `feature OP number`
+        self.simple_comparison: Optional[Tuple[str, int, float]] = self._classify(tree)
+    
+    def run(self, namespace: Dict[str, Any]) -> Any:
+        """
+        Evaluate the condition
+        
+        Args:
+            namespace: Variable names available to the condition
+        
+        Returns:
+            Result of the expression (KeyError if a name is undefined)
+        """
+        return self._run(namespace)
+    
+    def generic_visit(self, node: ast.AST):
+        raise ValueError(f"Unsupported expression: {type(node).__name__}")
+    
+    @staticmethod
+    def _lookup_op(table: Dict, op: ast.AST) -> Callable:
+        try:
+            return table[type(op)]
+        except KeyError:
+            raise ValueError(f"Unsupported operator: {type(op).__name__}") from None
+    
+    @staticmethod
+    def _dotted_name(node: ast.AST) -> Optional[str]:
+        """Namespace key for a Name or Attribute chain (market_data.price), else None"""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id in LITERAL_NAMES:
+            return None
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    
+    @staticmethod
+    def _numeric_constant(node: ast.AST) -> Optional[float]:
+        """Value of a numeric (or true/false) literal, else None"""
+        sign = 1
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            sign, node = -1, node.operand
+        if isinstance(node, ast.Name) and sign == 1:
+            value = LITERAL_NAMES.get(node.id)
+        elif isinstance(node, ast.Constant):
+            value = node.value
+        else:
+            return None
+        if isinstance(value, bool):
+            return float(value) if sign == 1 else None
+        if isinstance(value, (int, float)):
+            return float(sign * value)
+        return None
+    
+    def _literal_elements(self, node: ast.AST) -> tuple:
+        """Values of a list/tuple/set literal whose elements are all constants"""
+        values = []
+        for element in node.elts:
+            if isinstance(element, ast.Constant):
+                values.append(element.value)
+            elif isinstance(element, ast.Name) and element.id in LITERAL_NAMES:
+                values.append(LITERAL_NAMES[element.id])
+            else:
+                value = self._numeric_constant(element)
+                if value is None:
+                    raise ValueError("List, tuple and set literals may only contain constants")
+                values.append(value)
+        return tuple(values)
+    
+    def _classify(self, tree: ast.AST) -> Optional[Tuple[str, int, float]]:
+        """Detect conditions of the form `feature OP number`"""
+        node = tree.body if isinstance(tree, ast.Expression) else tree
+        if not isinstance(node, ast.Compare) or len(node.ops) != 1:
+            return None
+        op = SIMPLE_OPS.get(type(node.ops[0]))
+        key = self._dotted_name(node.left)
+        threshold = self._numeric_constant(node.comparators[0])
+        if op is None or key is None or threshold is None:
+            return None
+        return sys.intern(key), op, threshold
+    
+    def visit_Expression(self, node: ast.Expression):
+        return self.visit(node.body)
+    
+    def visit_Constant(self, node: ast.Constant):
+        value = node.value
+        return lambda ns: value
+    
+    def visit_Name(self, node: ast.Name):
+        if node.id in LITERAL_NAMES:
+            value = LITERAL_NAMES[node.id]
+            return lambda ns: value
+        
+        # Interned so namespace lookups hit the identity fast path
+        name = sys.intern(node.id)
+        self.referenced_names.add(name)
+        return lambda ns: ns[name]
+    
+    def visit_Attribute(self, node: ast.Attribute):
+        # market_data.price is read from the flattened namespace key "market_data.price",
+        # so no attribute access happens at evaluation time
+        key = self._dotted_name(node)
+        if key is None:
+            raise ValueError("Attribute access is only supported on variable names")
+        
+        key = sys.intern(key)
+        parent = sys.intern(key.rsplit(".", 1)[0])
+        self.referenced_names.add(key)
+        
+        def lookup(ns):
+            try:
+                return ns[key]
+            except KeyError:
+                # Missing key inside a known dict reads as None, unknown dict is an error
+                ns[parent]
+                return None
+        return lookup
+    
+    def visit_List(self, node: ast.List):
+        # Literals are folded at compile time; a fresh list per run keeps rules independent
+        values = self._literal_elements(node)
+        return lambda ns: list(values)
+    
+    def visit_Tuple(self, node: ast.Tuple):
+        values = self._literal_elements(node)
+        return lambda ns: values
+    
+    def visit_Set(self, node: ast.Set):
+        values = frozenset(self._literal_elements(node))
+        return lambda ns: values
+    
+    def _visit_comparator(self, op: ast.AST, node: ast.AST) -> Callable:
+        # `x in ('Low', 'Medium')` tests against a frozenset folded at compile time
+        if isinstance(op, (ast.In, ast.NotIn)) and isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = frozenset(self._literal_elements(node))
+            return lambda ns: values
+        return self.visit(node)
+    
+    def visit_Compare(self, node: ast.Compare):
+        left = self.visit(node.left)
+        comparisons = [
+            (self._lookup_op(COMPARE_OPS, op), self._visit_comparator(op, comparator))
+            for op, comparator in zip(node.ops, node.comparators)
+        ]
+        
+        if len(comparisons) == 1:
+            op, right = comparisons[0]
+            return lambda ns: op(left(ns), right(ns))
+        
+        def compare(ns):
+            a = left(ns)
+            for op, right in comparisons:
+                b = right(ns)
+                if not op(a, b):
+                    return False
+                a = b
+            return True
+        return compare
+    
+    def visit_BoolOp(self, node: ast.BoolOp):
+        values = [self.visit(value) for value in node.values]
+        is_and = isinstance(node.op, ast.And)
+        
+        # Same short-circuit semantics as Python's and/or
+        def bool_op(ns):
+            result = None
+            for value in values:
+                result = value(ns)
+                if bool(result) != is_and:
+                    return result
+            return result
+        return bool_op
+    
+    def visit_UnaryOp(self, node: ast.UnaryOp):
+        op = self._lookup_op(UNARY_OPS, node.op)
+        operand = self.visit(node.operand)
+        return lambda ns: op(operand(ns))
+    
+    def visit_BinOp(self, node: ast.BinOp):
+        op = self._lookup_op(BINARY_OPS, node.op)
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        return lambda ns: op(left(ns), right(ns))
+
+
+def compile_condition(condition: str) -> RuleEvaluator:
+    """
+    Parse a rule condition into a RuleEvaluator
+    
+    Args:
+        condition: Condition expression (e.g., "market_data.price > 0")
+    
+    Returns:
+        RuleEvaluator for the condition
+    
+    Raises:
+        SyntaxError: If the condition cannot be parsed
+        ValueError: If the condition uses an unsupported expression
+    """
+    return RuleEvaluator(ast.parse(condition, mode="eval"))
+
+
+def _eval_simple(features, feature_idx, ops, thresholds, out):
+    """Loop form of SimpleRuleBank.evaluate's comparisons (for the numba JIT)"""
+    for i in range(ops.shape[0]):
+        f = features[feature_idx[i]]
+        t = thresholds[i]
+        op = ops[i]
+        if op == 0:
+            out[i] = f <= t
+        elif op == 1:
+            out[i] = f < t
+        elif op == 2:
+            out[i] = f >= t
+        elif op == 3:
+            out[i] = f > t
+        elif op == 4:
+            out[i] = f == t
+        else:
+            out[i] = f != t
+
+
+# cache=True keeps the compiled kernel on disk across restarts
+_eval_simple_jit = njit(cache=True, boundscheck=False)(_eval_simple) if njit else None
+
+
+class SimpleRuleBank:
+    """
+    Rules of the form `feature OP number`, evaluated together with NumPy
+    
+    Stored column-wise (feature index, op code, threshold per rule) so a context
+    is checked against every simple rule in one vectorized pass.
+    """
+    
+    def __init__(self, comparisons: List[Tuple[str, int, float]]):
+        """
+        Args:
+            comparisons: RuleEvaluator.simple_comparison of each rule in the bank
+        """
+        self.keys = list(dict.fromkeys(key for key, _, _ in comparisons))
+        key_index = {key: i for i, key in enumerate(self.keys)}
+        self.feature_idx = np.array([key_index[key] for key, _, _ in comparisons], dtype=np.intp)
+        self.ops = np.array([op for _, op, _ in comparisons], dtype=np.uint8)
+        self.thresholds = np.array([threshold for _, _, threshold in comparisons], dtype=np.float64)
+        
+        # Warm the JIT now so the first real evaluation doesn't pay compile time
+        if _eval_simple_jit is not None:
+            self.evaluate({})
+    
+    def evaluate(self, namespace: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate every rule in the bank
+        
+        Args:
+            namespace: Flattened evaluation namespace
+        
+        Returns:
+            Tuple of (passed, valid) bool arrays - valid is False where the feature
+            is missing or not a number, and those rules need the general evaluator
+        """
+        features = np.full(len(self.keys), np.nan)
+        for i, key in enumerate(self.keys):
+            value = namespace.get(key)
+            if isinstance(value, (int, float)):
+                features[i] = value
+        
+        if _eval_simple_jit is not None:
+            passed = np.empty(len(self.ops), dtype=np.bool_)
+            _eval_simple_jit(features, self.feature_idx, self.ops, self.thresholds, passed)
+            return passed, ~np.isnan(features[self.feature_idx])
+        
+        f = features[self.feature_idx]
+        t = self.thresholds
+        passed = np.choose(self.ops, (f <= t, f < t, f >= t, f > t, f == t, f != t))
+        return passed, ~np.isnan(f)
@@ -3,14 +3,38 @@ Verification Rules Engine for VERDICT
 Mini DSL for defining and evaluating verification rules
 """
 
+import sys
 import yaml
 import re
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from operator import attrgetter
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
 from pathlib import Path
 import logging
 
+from rule_compiler import RuleEvaluator, SimpleRuleBank, compile_condition
+
+# libYAML's C loader when available (hot reloads), pure-Python otherwise
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 logger = logging.getLogger(__name__)
 
+def _flatten(data: Dict, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (dotted_key, value) pairs for a nested dictionary
+    
+    Nested dicts are yielded themselves as well as their children, e.g.
+    {"market_data": {"price": 1}} -> ("market_data", {...}), ("market_data.price", 1)
+    """
+    for key, value in data.items():
+        dotted_key = sys.intern(f"{prefix}{key}")
+        yield dotted_key, value
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{dotted_key}.")
+
 
 class Rule:
     """Represents a single verification rule"""
@@ -23,6 +47,27 @@ class Rule:
         self.severity = rule_dict.get("severity", "medium")  # critical, high, medium, low
         self.message = rule_dict.get("message", "Rule failed")
         self.description = rule_dict.get("description", "")
+        
+        # Compile the condition once at load time instead of on every evaluation
+        self.evaluator: Optional[RuleEvaluator] = None
+        self.referenced_names: Set[str] = set()
+        self.simple_comparison: Optional[Tuple[str, int, float]] = None
+        self.const_result: Optional[bool] = None
+        self.compile_error: Optional[str] = None
+        
+        condition = str(self.condition).strip()
+        if condition.lower() == "true":
+            self.const_result = True
+        elif condition.lower() == "false":
+            self.const_result = False
+        else:
+            try:
+                self.evaluator = compile_condition(condition)
+                self.referenced_names = self.evaluator.referenced_names
+                self.simple_comparison = self.evaluator.simple_comparison
+            except (SyntaxError, ValueError) as e:
+                self.compile_error = f"Invalid condition '{condition}': {getattr(e, 'msg', e)}"
+                logger.error(f"[RulesEngine] Rule '{self.name}' has an invalid condition: {e}")
     
     def to_dict(self) -> Dict:
         """Convert rule to dictionary"""
@@ -73,6 +118,11 @@ class RulesEngine:
         """
         self.rules_file = rules_file
         self.rules: List[Rule] = []
+        # Every name referenced by any loaded rule - derived values are only computed if used
+        self._all_names: Set[str] = set()
+        # Indexes of `feature OP number` rules, evaluated together by _simple_bank
+        self._simple_rules: List[int] = []
+        self._simple_bank: Optional[SimpleRuleBank] = None
         self.load_rules()
     
     def load_rules(self) -> bool:
@@ -90,7 +140,7 @@ class RulesEngine:
                 return False
             
             with open(rules_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
             
             if not config or 'rules' not in config:
                 logger.error("[RulesEngine] Invalid rules file format - missing 'rules' key")
@@ -106,6 +156,12 @@ class RulesEngine:
                     logger.error(f"[RulesEngine] Error parsing rule: {e}")
                     continue
             
+            self._all_names = set().union(*(rule.referenced_names for rule in self.rules))
+            self._simple_rules = [i for i, rule in enumerate(self.rules) if rule.simple_comparison]
+            self._simple_bank = SimpleRuleBank(
+                [self.rules[i].simple_comparison for i in self._simple_rules]
+            ) if self._simple_rules else None
+            
             logger.info(f"[RulesEngine] Loaded {len(self.rules)} verification rules")
             return True
             
@@ -142,10 +198,25 @@ class RulesEngine:
         critical_failures = 0
         should_block = False
         
+        # Build the namespace once, shared by every rule
+        namespace = self._build_namespace(context)
+        
+        # Decide simple comparison rules in one vectorized pass; rules whose
+        # feature is missing or non-numeric stay None and use the general evaluator
+        simple_passed: List[Optional[bool]] = [None] * len(self.rules)
+        if self._simple_bank is not None:
+            passed, valid = self._simple_bank.evaluate(namespace)
+            for rule_idx, rule_passed, is_valid in zip(self._simple_rules, passed.tolist(), valid.tolist()):
+                if is_valid:
+                    simple_passed[rule_idx] = rule_passed
+        
         # Evaluate each rule
-        for rule in self.rules:
+        for rule, precomputed in zip(self.rules, simple_passed):
             try:
-                result = self._evaluate_rule(rule, context)
+                if precomputed is not None:
+                    result = RuleEvaluationResult(rule, precomputed)
+                else:
+                    result = self._evaluate_rule(rule, namespace)
                 results.append(result.to_dict())
                 
                 if result.passed:
@@ -194,20 +265,23 @@ class RulesEngine:
             "timestamp": context.get("timestamp", "")
         }
     
-    def _evaluate_rule(self, rule: Rule, context: Dict) -> RuleEvaluationResult:
+    def _evaluate_rule(self, rule: Rule, namespace: Dict[str, Any]) -> RuleEvaluationResult:
         """
         Evaluate a single rule
         
         Args:
             rule: Rule to evaluate
-            context: Evaluation context
+            namespace: Evaluation namespace from _build_namespace
             
         Returns:
             RuleEvaluationResult
         """
         try:
-            # Parse and evaluate the condition
-            condition_result = self._evaluate_condition(rule.condition, context)
+            if rule.compile_error:
+                return RuleEvaluationResult(rule, False, error=rule.compile_error)
+            
+            # Evaluate the precompiled condition
+            condition_result = self._evaluate_condition(rule, namespace)
             
             # Rule passes if condition evaluates to True
             passed = bool(condition_result)
@@ -218,36 +292,27 @@ class RulesEngine:
             logger.error(f"[RulesEngine] Error evaluating rule '{rule.name}': {e}")
             return RuleEvaluationResult(rule, False, error=str(e))
     
-    def _evaluate_condition(self, condition: str, context: Dict) -> bool:
+    def _evaluate_condition(self, rule: Rule, namespace: Dict[str, Any]) -> bool:
         """
-        Evaluate a rule condition
+        Evaluate a rule's precompiled condition
         
         Args:
-            condition: Condition string (e.g., "ftso_price_diff_pct <= 2.0")
-            context: Evaluation context
+            rule: Rule whose condition to evaluate (e.g., "ftso_price_diff_pct <= 2.0")
+            namespace: Evaluation namespace from _build_namespace
             
         Returns:
             Boolean result of condition evaluation
         """
-        # Build safe evaluation namespace with context variables
-        namespace = self._build_namespace(context)
-        
-        # Replace comparison operators and boolean keywords for Python
-        condition = condition.strip()
-        
-        # Handle special cases
-        if condition.lower() == "true":
-            return True
-        if condition.lower() == "false":
-            return False
+        # Literal true/false conditions need no namespace at all
+        if rule.const_result is not None:
+            return rule.const_result
         
         # Evaluate condition in safe namespace
         try:
-            # Use eval with restricted namespace for safety
-            result = eval(condition, {"__builtins__": {}}, namespace)
+            result = rule.evaluator.run(namespace)
             return bool(result)
         except Exception as e:
-            logger.error(f"[RulesEngine] Condition evaluation error: {condition} -> {e}")
+            logger.error(f"[RulesEngine] Condition evaluation error: {rule.condition} -> {e}")
             # If we can't evaluate, fail safe (return False)
             return False
     
@@ -261,53 +326,33 @@ class RulesEngine:
         Returns:
             Namespace dictionary with flattened variables
         """
-        # Helper class to allow dot notation access to dictionaries
-        class DotDict:
-            def __init__(self, data):
-                self._data = data
-            
-            def __getattr__(self, key):
-                value = self._data.get(key)
-                if isinstance(value, dict):
-                    return DotDict(value)
-                return value
-        
         namespace = {}
         
-        # Add direct context values
+        # Add context values, with nested dicts flattened to dotted keys
+        # (market_data.price -> namespace["market_data.price"])
         for key, value in context.items():
             if not key.startswith('_'):
                 namespace[key] = value
+                if isinstance(value, dict):
+                    namespace.update(_flatten(value, f"{key}."))
         
-        # Add nested dictionary access with dot notation support
-        if 'market_data' in context:
-            namespace['market_data'] = DotDict(context['market_data'])
-        
-        if 'sentiment_data' in context:
-            namespace['sentiment_data'] = DotDict(context['sentiment_data'])
-        
-        if 'leverage_suggestion' in context:
-            namespace['leverage_suggestion'] = DotDict(context['leverage_suggestion'])
-        
-        # Calculate FTSO price difference percentage if available
-        if 'ftso_price' in context and 'market_data' in context:
-            ftso_price = context.get('ftso_price', 0)
-            declared_price = context.get('market_data', {}).get('price', 0)
-            
-            if declared_price > 0:
-                price_diff_pct = abs(ftso_price - declared_price) / declared_price * 100
-                namespace['ftso_price_diff_pct'] = price_diff_pct
-            else:
-                namespace['ftso_price_diff_pct'] = 100.0  # Invalid price
-        
-        # Add Python boolean values for YAML comparisons
-        namespace['true'] = True
-        namespace['True'] = True
-        namespace['false'] = False
-        namespace['False'] = False
-        namespace['null'] = None
-        namespace['None'] = None
+        # Calculate FTSO price difference percentage if available and used by a rule
+        if ('ftso_price_diff_pct' in self._all_names
+                and 'ftso_price' in context and 'market_data' in context):
+            try:
+                ftso_price = context.get('ftso_price', 0)
+                declared_price = context.get('market_data', {}).get('price', 0)
+                
+                if declared_price > 0:
+                    price_diff_pct = abs(ftso_price - declared_price) / declared_price * 100
+                    namespace['ftso_price_diff_pct'] = price_diff_pct
+                else:
+                    namespace['ftso_price_diff_pct'] = 100.0  # Invalid price
+            except (TypeError, AttributeError) as e:
+                # Left undefined, so only the rules that use it fail
+                logger.warning(f"[RulesEngine] Cannot compute ftso_price_diff_pct: {e}")
         
+        # YAML true/false/null are folded into constants by the rule compiler
         return namespace
     
     def get_rules_summary(self) -> Dict:
@@ -326,12 +371,8 @@ class RulesEngine:
         }
     
     def _count_by_attribute(self, attribute: str) -> Dict[str, int]:
-        """Count rules by a specific attribute"""
-        counts = {}
-        for rule in self.rules:
-            value = getattr(rule, attribute, "unknown")
-            counts[value] = counts.get(value, 0) + 1
-        return counts
+        """Count rules by a specific attribute (Rule sets a default for every attribute)"""
+        return dict(Counter(map(attrgetter(attribute), self.rules)))
     
     def reload_rules(self) -> bool:
         """
@@ -2,26 +2,575 @@
 Google Gemini-powered sentiment analysis for tokens with Flare FDC verification
 """
 import os
+import re
+import logging
+import math
+import time
+import random
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import weakref
 import google.generativeai as genai
-from typing import Dict, Optional
-import json
-from datetime import datetime
+from google.generativeai import client as genai_client
+from google.api_core.exceptions import ResourceExhausted
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import orjson
 
+logger = logging.getLogger(__name__)
 
-class SentimentAnalyzer:
-    def __init__(self, api_key: str, fdc_connector=None):
-        # Configure Gemini with API key
+# Keywords for the fallback text sentiment, each matched as a word prefix
+# so inflections ("declined", "strongly") still count
+POSITIVE_KEYWORDS = ('bullish', 'positive', 'strong', 'growth', 'upward')
+NEGATIVE_KEYWORDS = ('bearish', 'negative', 'weak', 'decline', 'downward')
+_POS_RE = re.compile(r"\b(?:" + "|".join(POSITIVE_KEYWORDS) + ")")
+_NEG_RE = re.compile(r"\b(?:" + "|".join(NEGATIVE_KEYWORDS) + ")")
+
+
+# Per-feature distance at which two market snapshots stop sharing a sentiment
+# answer: 1h/24h/7d change in percentage points, then log10 of price (~1%),
+# market cap (~12%) and 24h volume (~26%)
+SIMILARITY_TOLERANCES = np.array([0.5, 1.0, 2.0, 0.005, 0.05, 0.1])
+
+
+# google-generativeai keeps a GenerativeModel's gRPC clients in its private
+# _client/_async_client attributes and otherwise builds them from the process-global
+# genai.configure() key. Binding our pooled clients there is what gives every API
+# key (BYOK) its own channel; _bind_clients is the only code that touches those
+# attributes, and only for the SDK series pinned in requirements.txt
+_GENAI_SUPPORTED_SERIES = "0.8."
+
+
+def _bind_clients(model: genai.GenerativeModel, client=None, async_client=None):
+    """Make model send its calls through the given sync and/or async client"""
+    if not genai.__version__.startswith(_GENAI_SUPPORTED_SERIES) or not hasattr(model, "_async_client"):
+        raise RuntimeError(
+            f"google-generativeai {genai.__version__} is not supported "
+            f"(client binding is written for {_GENAI_SUPPORTED_SERIES}x)"
+        )
+    if client is not None:
+        model._client = client
+    if async_client is not None:
+        model._async_client = async_client
+
+
+# {api_key: [client, {event loop: (async_client, {model_name: model})}, analyzers
+# holding the entry]} shared by every analyzer for that key, so a new
+# SentimentAnalyzer reuses the open keep-alive channels instead of dialing (DNS +
+# TLS) again. gRPC aio channels belong to the loop they were created in, so async
+# clients are created lazily inside each running loop. An entry lives while an
+# analyzer holds it and is closed by the last one's close(), so one analyzer never
+# closes channels another is still using
+_CLIENT_POOL: Dict[str, list] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _pool_entry(api_key: str) -> list:
+    """
+    Pool entry for api_key, creating its sync client on first use (caller holds _CLIENT_POOL_LOCK)
+    
+    genai.configure() is process-global, so clients are created under the lock
+    while the global config holds this key.
+    """
+    entry = _CLIENT_POOL.get(api_key)
+    if entry is None:
         genai.configure(api_key=api_key)
-        # Use gemini-2.5-flash for speed and real-time trading analysis
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        entry = _CLIENT_POOL[api_key] = [genai_client.get_default_generative_client(),
+                                         weakref.WeakKeyDictionary(), 0]
+    return entry
+
+
+def _get_client(api_key: str):
+    """Pooled sync Gemini client for api_key, created on first use"""
+    with _CLIENT_POOL_LOCK:
+        return _pool_entry(api_key)[0]
+
+
+def _get_async_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    """
+    GenerativeModel bound to api_key's async client for the running event loop
+    
+    Must be called inside the loop that will await the model's calls; the
+    client and model are created on the first call in each loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _CLIENT_POOL_LOCK:
+        entry = _pool_entry(api_key)
+        per_loop = entry[1].get(loop)
+        if per_loop is None:
+            genai.configure(api_key=api_key)
+            per_loop = entry[1][loop] = (genai_client.get_default_generative_async_client(), {})
+        async_client, models = per_loop
+        model = models.get(model_name)
+        if model is None:
+            model = models[model_name] = genai.GenerativeModel(model_name)
+            _bind_clients(model, async_client=async_client)
+        return model
+
+
+def _acquire_clients(api_key: str):
+    """Take a reference on api_key's pooled clients (matched by one _release_clients)"""
+    with _CLIENT_POOL_LOCK:
+        _pool_entry(api_key)[2] += 1
+
+
+def _release_clients(api_key: str) -> Optional[Tuple[object, Dict]]:
+    """
+    Drop a reference on api_key's pooled clients
+    
+    Returns:
+        (client, {event loop: (async_client, models)}) for the caller to close
+        if that was the last reference - they and the models bound to them are
+        removed from the pool - else None
+    """
+    # Same lock order as _get_model (models, then clients), so no analyzer can
+    # pick up a cached model whose clients are being closed
+    with _MODEL_CACHE_LOCK, _CLIENT_POOL_LOCK:
+        entry = _CLIENT_POOL.get(api_key)
+        if entry is None:
+            return None
+        entry[2] -= 1
+        if entry[2] > 0:
+            return None
+        del _CLIENT_POOL[api_key]
+        for cache_key in [cache_key for cache_key in _MODEL_CACHE if cache_key[0] == api_key]:
+            del _MODEL_CACHE[cache_key]
+    return entry[0], dict(entry[1])
+
+
+# Prompt pieces that never change are built once at import. Every prompt starts
+# with its static head (instructions) and ends with the per-call market data, so
+# requests share one long identical prefix that Gemini can cache
+_SENTIMENT_INSTRUCTIONS = """Analyze crypto token sentiment based on market data.
+
+Provide:
+1. Overall sentiment score (-100 to +100, where -100 is very bearish, +100 is very bullish)
+2. Short-term sentiment (next 1-4 hours)
+3. Medium-term sentiment (next 24 hours)
+4. Key factors influencing the sentiment
+5. Risk assessment (Low/Medium/High)
+Keep the reasoning to one short sentence (under 80 characters).
+"""
+
+PROMPT_HEAD = _SENTIMENT_INSTRUCTIONS
+
+BATCH_PROMPT_HEAD = f"{_SENTIMENT_INSTRUCTIONS}Answer for every token, keyed by its symbol.\n"
+
+# Answer format, enforced by Gemini's structured output instead of being spelled
+# out in the prompt - the reply is always bare JSON, with no free-form text
+SENTIMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_sentiment": {"type": "number", "description": "-100 (very bearish) to +100 (very bullish)"},
+        "short_term_sentiment": {"type": "number", "description": "Next 1-4 hours, -100 to +100"},
+        "medium_term_sentiment": {"type": "number", "description": "Next 24 hours, -100 to +100"},
+        "key_factors": {"type": "array", "items": {"type": "string"}},
+        "risk_level": {"type": "string", "format": "enum", "enum": ["Low", "Medium", "High"]},
+        "reasoning": {"type": "string", "description": "One short sentence"}
+    },
+    "required": ["overall_sentiment", "short_term_sentiment", "medium_term_sentiment",
+                 "key_factors", "risk_level", "reasoning"]
+}
+
+_SENTIMENT_CONFIG = genai.GenerationConfig(response_mime_type="application/json",
+                                           response_schema=SENTIMENT_SCHEMA)
+
+
+def _batch_config(token_symbols: List[str]) -> genai.GenerationConfig:
+    """Structured-output config for a batched answer: one SENTIMENT_SCHEMA per symbol"""
+    symbols = list(dict.fromkeys(token_symbols))
+    return genai.GenerationConfig(response_mime_type="application/json", response_schema={
+        "type": "object",
+        "properties": {symbol: SENTIMENT_SCHEMA for symbol in symbols},
+        "required": symbols
+    })
+
+
+def _market_block(token_symbol: str, token_name: str, market_data: Dict) -> str:
+    """Dynamic part of a sentiment prompt - one token's market data"""
+    return (
+        f"{token_name} ({token_symbol}):\n"
+        f"Current Price: ${market_data.get('price', 0):,.2f}\n"
+        f"1h Change: {market_data.get('percent_change_1h', 0):.2f}%\n"
+        f"24h Change: {market_data.get('percent_change_24h', 0):.2f}%\n"
+        f"7d Change: {market_data.get('percent_change_7d', 0):.2f}%\n"
+        f"Market Cap: ${market_data.get('market_cap', 0):,.0f}\n"
+        f"24h Volume: ${market_data.get('volume_24h', 0):,.0f}\n"
+    )
+
+
+# {(api_key, model_name): GenerativeModel} - analyzers share one model wrapper per
+# key and model for sync calls, bound to that key's pooled sync client (dropped
+# with it). Async calls use the per-loop models from _get_async_model
+_MODEL_CACHE: Dict[Tuple[str, str], genai.GenerativeModel] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _get_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    """Shared GenerativeModel for sync calls with (api_key, model_name), built on first use"""
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get((api_key, model_name))
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            # Bind the pooled client for our key, so every call reuses one keep-alive
+            # channel and a later configure() for another key (BYOK) doesn't redirect
+            # our requests
+            _bind_clients(model, client=_get_client(api_key))
+            _MODEL_CACHE[(api_key, model_name)] = model
+        return model
+
+
+def _log10(value: float) -> float:
+    """log10 of a positive amount, 0.0 for missing or non-positive values"""
+    return math.log10(value) if value and value > 0 else 0.0
+
+
+def _log_bucket(value: float) -> float:
+    """Bucket a large positive amount by log10 in 0.1 steps (~26% wide)"""
+    return round(_log10(value), 1)
+
+
+def _bucket_key(token_symbol: str, market_data: Dict, verified: bool) -> bytes:
+    """
+    Cache key for a sentiment request - market data quantized so near-identical
+    snapshots (a few seconds apart) share one Gemini answer
+    """
+    return hashlib.sha256(orjson.dumps({
+        "s": token_symbol,
+        "p": float(f"{market_data.get('price', 0) or 0:.4g}"),
+        "c1": round(market_data.get('percent_change_1h', 0) or 0, 1),
+        "c24": round(market_data.get('percent_change_24h', 0) or 0, 1),
+        "c7": round(market_data.get('percent_change_7d', 0) or 0, 1),
+        "mc": _log_bucket(market_data.get('market_cap', 0)),
+        "v": _log_bucket(market_data.get('volume_24h', 0)),
+        "fdc": verified
+    })).digest()
+
+
+def _snapshot_vector(market_data: Dict) -> np.ndarray:
+    """Market data as a vector scaled by SIMILARITY_TOLERANCES (1.0 = at tolerance)"""
+    return np.array([
+        market_data.get('percent_change_1h', 0) or 0,
+        market_data.get('percent_change_24h', 0) or 0,
+        market_data.get('percent_change_7d', 0) or 0,
+        _log10(market_data.get('price', 0)),
+        _log10(market_data.get('market_cap', 0)),
+        _log10(market_data.get('volume_24h', 0))
+    ], dtype=np.float64) / SIMILARITY_TOLERANCES
+
+
+class _SnapshotRing:
+    """
+    Recent sentiment answers for one token, looked up by nearest market snapshot
+    
+    Catches the near-misses of the exact bucket cache (a value sitting on a bucket
+    edge) with one vectorized distance over a small fixed-size matrix.
+    """
+    __slots__ = ("vectors", "expires", "results", "next")
+    
+    def __init__(self, size: int):
+        self.vectors = np.zeros((size, len(SIMILARITY_TOLERANCES)))
+        self.expires = np.zeros(size)
+        self.results: List[Optional[Dict]] = [None] * size
+        self.next = 0
+    
+    def find(self, vector: np.ndarray, now: float) -> Optional[Dict]:
+        """Closest unexpired answer within tolerance on every feature, else None"""
+        distance = np.abs(self.vectors - vector).max(axis=1)
+        distance[self.expires <= now] = np.inf
+        i = int(distance.argmin())
+        return self.results[i] if distance[i] <= 1.0 else None
+    
+    def add(self, vector: np.ndarray, sentiment_data: Dict, expires_at: float):
+        """Store an answer, overwriting the oldest slot"""
+        i = self.next
+        self.vectors[i] = vector
+        self.expires[i] = expires_at
+        self.results[i] = sentiment_data
+        self.next = (i + 1) % len(self.results)
+
+
+class _DiskCache:
+    """
+    sqlite-backed sentiment cache that survives restarts and is shared by every
+    worker process pointing at the same file (WAL mode allows concurrent readers)
+    
+    Expiry is stored as wall-clock time, since monotonic clocks don't carry over
+    between processes.
+    """
+    # Expired rows are deleted every this many writes
+    PRUNE_EVERY = 256
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment (key BLOB PRIMARY KEY, expires_at REAL, data BLOB)"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+    
+    def get(self, key: bytes) -> Optional[Tuple[float, Dict]]:
+        """Return (seconds left, sentiment_data) for key if still fresh"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, data FROM sentiment WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return (row[0] - now, orjson.loads(row[1])) if row else None
+    
+    def put(self, key: bytes, sentiment_data: Dict, ttl_seconds: float):
+        """Store sentiment_data for ttl_seconds"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sentiment (key, expires_at, data) VALUES (?, ?, ?)",
+                (key, now + ttl_seconds, orjson.dumps(sentiment_data))
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM sentiment WHERE expires_at <= ?", (now,))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _RateLimiter:
+    """
+    Token bucket - at most `rate` requests per `period` seconds
+    
+    Requests over the budget wait their turn here instead of being rejected
+    with 429 and retried after the provider's back-off. Shared by the event
+    loop (acquire) and worker threads (acquire_sync).
+    """
+    __slots__ = ("rate", "period", "tokens", "updated", "_lock")
+    
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self) -> float:
+        """Take a token if one is available (returns 0), else seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) * self.period / self.rate
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while (delay := self._take()) > 0:
+            await asyncio.sleep(delay)
+    
+    def acquire_sync(self):
+        """Block the calling thread until a request may be sent"""
+        while (delay := self._take()) > 0:
+            time.sleep(delay)
+
+
+# Moves sharp enough that the recommendation doesn't depend on LLM nuance:
+# |24h change| and |1h change| above these (in %), both in the same direction
+FAST_PATH_CHANGE_24H = 15.0
+FAST_PATH_CHANGE_1H = 5.0
+
+
+def _fast_path(market_data: Dict) -> Optional[Dict]:
+    """
+    Rule-based sentiment for extreme market moves, so Gemini isn't called
+    
+    Returns:
+        Sentiment data (without fdc_* fields), or None if the move isn't extreme
+    """
+    change_24h = float(market_data.get('percent_change_24h', 0) or 0)
+    change_1h = float(market_data.get('percent_change_1h', 0) or 0)
+    if abs(change_24h) <= FAST_PATH_CHANGE_24H or abs(change_1h) <= FAST_PATH_CHANGE_1H:
+        return None
+    if (change_24h > 0) != (change_1h > 0):
+        return None
+    
+    overall = max(-100.0, min(100.0, change_24h * 4))
+    direction = "up" if change_24h > 0 else "down"
+    very_extreme = abs(change_24h) > 2 * FAST_PATH_CHANGE_24H or abs(change_1h) > 2 * FAST_PATH_CHANGE_1H
+    return {
+        "overall_sentiment": overall,
+        "short_term_sentiment": max(-100.0, min(100.0, change_1h * 10)),
+        "medium_term_sentiment": overall,
+        "key_factors": [f"Sharp 24h move ({change_24h:+.1f}%)", f"Strong 1h momentum ({change_1h:+.1f}%)"],
+        "risk_level": "High" if very_extreme else "Medium",
+        "reasoning": f"Rule-based: extreme {direction}ward move, LLM analysis skipped"
+    }
+
+
+def _is_valid_sentiment(sentiment_data) -> bool:
+    """Whether a parsed answer has in-range scores and a known risk level"""
+    if not isinstance(sentiment_data, dict):
+        return False
+    for field in ("overall_sentiment", "short_term_sentiment", "medium_term_sentiment"):
+        score = sentiment_data.get(field)
+        if not isinstance(score, (int, float)) or not -100 <= score <= 100:
+            return False
+    return sentiment_data.get("risk_level") in ("Low", "Medium", "High")
+
+
+def _parse_sentiment(response_text: str) -> Optional[Dict]:
+    """Parsed sentiment answer, or None if it isn't valid JSON or fails _is_valid_sentiment"""
+    try:
+        sentiment_data = orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        return None
+    return sentiment_data if _is_valid_sentiment(sentiment_data) else None
+
+
+def _with_fdc_metadata(sentiment_data: Dict, verified_data) -> Dict:
+    """Copy of sentiment_data carrying the current request's FDC verification fields"""
+    result = dict(sentiment_data)
+    result["fdc_verified"] = verified_data.verified if verified_data else False
+    result["fdc_hash"] = verified_data.hash if verified_data else None
+    result["fdc_timestamp"] = verified_data.timestamp if verified_data else None
+    return result
+
+
+class SentimentAnalyzer:
+    # Gemini answers are reused for this long per (symbol, bucketed market data)
+    SENTIMENT_CACHE_TTL_SECONDS = 30
+    SENTIMENT_CACHE_MAX_ENTRIES = 2048
+    # Recent answers kept per token for the nearest-snapshot lookup
+    SIMILARITY_RING_SIZE = 64
+    SIMILARITY_MAX_TOKENS = 256
+    # Most tokens sent to Gemini in one batched prompt
+    BATCH_MAX_TOKENS = 20
+    # Client-side request budget (match the API key's RPM tier) and 429 retries
+    GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_RPM", "60"))
+    GEMINI_MAX_RETRIES = 3
+    # sqlite file for the persistent sentiment cache (unset = memory only)
+    SENTIMENT_DISK_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH")
+    # |overall_sentiment| above which a LONG/SHORT is recommended
+    RECOMMENDATION_THRESHOLD = 5
+    
+    def __init__(self, api_key: str, fdc_connector=None,
+                 model_name: str = "gemini-2.5-flash-lite",
+                 fallback_model_name: Optional[str] = "gemini-2.5-flash"):
+        """
+        Args:
+            api_key: Gemini API key
+            fdc_connector: Optional FlareDataConnector for verification
+            model_name: Model for sentiment calls - scoring is a simple task, so
+                the fast lite model is the default
+            fallback_model_name: Model to retry with when an answer is not valid
+                JSON or out of bounds (None to disable)
+        """
+        self.api_key = api_key
+        # Released by close(); the pooled clients stay open while any analyzer holds them
+        _acquire_clients(api_key)
+        self._holds_clients = True
+        self.model = _get_model(api_key, model_name)
+        self.fallback_model = (_get_model(api_key, fallback_model_name)
+                               if fallback_model_name and fallback_model_name != model_name else None)
+        # Answers per model, to tune the primary/fallback choice
+        self.model_routes = {"primary": 0, "fallback": 0}
+        
+        self._limiter = _RateLimiter(self.GEMINI_REQUESTS_PER_MINUTE)
         
         # Flare Data Connector for verification
         self.fdc = fdc_connector
+        
+        # {bucket_key: (expires_at, sentiment_data without fdc_* fields)} in LRU
+        # order, plus the Gemini call in flight per key so concurrent misses share it
+        self._sentiment_cache: Dict[bytes, Tuple[float, Dict]] = {}
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        # {(token_symbol, fdc_verified): ring of recent answers} for similar snapshots
+        self._similar_cache: Dict[Tuple[str, bool], _SnapshotRing] = {}
+        self._disk_cache = _DiskCache(self.SENTIMENT_DISK_CACHE_PATH) if self.SENTIMENT_DISK_CACHE_PATH else None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._disk_hits = 0
+        # Running Gemini token usage across calls (see get_stats)
+        self.token_stats = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+        # Guards the in-memory caches, model_routes, token_stats and counters,
+        # which analyze_many_sync's worker threads update concurrently
+        self._state_lock = threading.Lock()
+    
+    def _cache_get(self, key: bytes, token_symbol: str, market_data: Dict,
+                   verified: bool) -> Optional[Dict]:
+        """
+        Return cached sentiment for key if still fresh (and mark it recently used),
+        else the answer for key from the disk cache, else a fresh answer for a
+        similar snapshot of the same token
+        
+        Exact matches come first, so the approximate lookup only serves keys
+        no cache has an answer for.
+        """
+        with self._state_lock:
+            cached = self._sentiment_cache.pop(key, None)
+            if cached is not None and cached[0] > time.monotonic():
+                self._sentiment_cache[key] = cached
+                return cached[1]
+        
+        if self._disk_cache is not None:
+            stored = self._disk_cache.get(key)
+            if stored is not None:
+                ttl, sentiment_data = stored
+                with self._state_lock:
+                    self._disk_hits += 1
+                    self._remember(key, time.monotonic() + ttl, sentiment_data)
+                return sentiment_data
+        
+        with self._state_lock:
+            ring = self._similar_cache.get((token_symbol, verified))
+            if ring is None:
+                return None
+            return ring.find(_snapshot_vector(market_data), time.monotonic())
+    
+    def _remember(self, key: bytes, expires_at: float, sentiment_data: Dict):
+        """Insert into the in-memory LRU, evicting the least recently used entry when full (caller holds _state_lock)"""
+        if len(self._sentiment_cache) >= self.SENTIMENT_CACHE_MAX_ENTRIES:
+            self._sentiment_cache.pop(next(iter(self._sentiment_cache)))
+        self._sentiment_cache[key] = (expires_at, sentiment_data)
+    
+    def _cache_put(self, key: bytes, token_symbol: str, market_data: Dict,
+                   verified: bool, sentiment_data: Dict):
+        """Cache a sentiment result (error results, risk_level "Unknown", are skipped)"""
+        if sentiment_data.get("risk_level") == "Unknown":
+            return
+        if self._disk_cache is not None:
+            self._disk_cache.put(key, sentiment_data, self.SENTIMENT_CACHE_TTL_SECONDS)
+        
+        vector = _snapshot_vector(market_data)
+        with self._state_lock:
+            expires_at = time.monotonic() + self.SENTIMENT_CACHE_TTL_SECONDS
+            self._remember(key, expires_at, sentiment_data)
+            
+            ring = self._similar_cache.get((token_symbol, verified))
+            if ring is None:
+                if len(self._similar_cache) >= self.SIMILARITY_MAX_TOKENS:
+                    self._similar_cache.pop(next(iter(self._similar_cache)))
+                ring = self._similar_cache[(token_symbol, verified)] = _SnapshotRing(self.SIMILARITY_RING_SIZE)
+            ring.add(vector, sentiment_data, expires_at)
+    
+    def _count(self, hits: int = 0, misses: int = 0):
+        """Add to the cache hit/miss counters"""
+        with self._state_lock:
+            self._cache_hits += hits
+            self._cache_misses += misses
     
     async def analyze_token_sentiment(self, token_symbol: str, token_name: str, 
                                 market_data: Dict, verified_data=None) -> Dict:
         """
-        Analyze sentiment for a token based on verified market data
+        Analyze sentiment for a token, reusing a recent answer for similar market data
+        
+        Extreme moves (see _fast_path) are answered by rule without calling Gemini.
         
         Args:
             token_symbol: Token symbol (e.g., "BTC")
@@ -32,125 +581,445 @@ class SentimentAnalyzer:
         Returns:
             Sentiment analysis with verification metadata
         """
+        fast = _fast_path(market_data)
+        if fast is not None:
+            return _with_fdc_metadata(fast, verified_data)
+        
+        verified = bool(verified_data and verified_data.verified)
+        key = _bucket_key(token_symbol, market_data, verified)
+        cached = self._cache_get(key, token_symbol, market_data, verified)
+        if cached is not None:
+            self._count(hits=1)
+            return _with_fdc_metadata(cached, verified_data)
+        
+        # Singleflight: a miss already being analyzed is awaited, not requested again
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self._count(misses=1)
+            inflight = asyncio.ensure_future(self._analyze_and_cache(key, token_symbol, token_name,
+                                                                     market_data, verified_data))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._count(hits=1)
+        
+        # Shielded so a cancelled caller doesn't cancel the call others are waiting on
+        return _with_fdc_metadata(await asyncio.shield(inflight), verified_data)
+    
+    async def _analyze_and_cache(self, key: bytes, token_symbol: str, token_name: str,
+                                 market_data: Dict, verified_data) -> Dict:
+        """Uncached analysis whose result is stored under key"""
+        sentiment_data = await self._analyze_token_sentiment(token_symbol, token_name,
+                                                             market_data, verified_data)
+        self._cache_put(key, token_symbol, market_data,
+                        bool(verified_data and verified_data.verified), sentiment_data)
+        return sentiment_data
+    
+    def analyze_token_sentiment_sync(self, token_symbol: str, token_name: str,
+                                     market_data: Dict, verified_data=None) -> Dict:
+        """
+        Blocking analyze_token_sentiment for code without an event loop (e.g. main.py)
+        
+        Same caching and fast path as the async method; safe to call from worker threads.
+        """
+        fast = _fast_path(market_data)
+        if fast is not None:
+            return _with_fdc_metadata(fast, verified_data)
+        
+        verified = bool(verified_data and verified_data.verified)
+        key = _bucket_key(token_symbol, market_data, verified)
+        cached = self._cache_get(key, token_symbol, market_data, verified)
+        if cached is not None:
+            self._count(hits=1)
+            return _with_fdc_metadata(cached, verified_data)
+        
+        self._count(misses=1)
+        sentiment_data = self._analyze_token_sentiment_sync(token_symbol, token_name,
+                                                            market_data, verified_data)
+        self._cache_put(key, token_symbol, market_data, verified, sentiment_data)
+        return _with_fdc_metadata(sentiment_data, verified_data)
+    
+    async def _analyze_token_sentiment(self, token_symbol: str, token_name: str,
+                                       market_data: Dict, verified_data=None) -> Dict:
+        """
+        Analyze sentiment for a token based on verified market data (uncached)
+        
+        Args:
+            token_symbol: Token symbol (e.g., "BTC")
+            token_name: Full token name
+            market_data: Market data dictionary
+            verified_data: Optional VerifiedData from FDC
+            
+        Returns:
+            Sentiment analysis without fdc_* fields (shared through the caches;
+            callers add them with _with_fdc_metadata)
+        """
+        try:
+            request_start = time.perf_counter()
+            prompt = self._build_prompt(token_symbol, token_name, market_data, verified_data)
+            
+            # Generate content with Gemini (streamed, without blocking the event loop)
+            response_text = await self._generate_text(prompt, _SENTIMENT_CONFIG)
+            sentiment_data = _parse_sentiment(response_text)
+            route = "primary"
+            
+            if sentiment_data is None and self.fallback_model is not None:
+                self._log_fallback(token_symbol)
+                response_text = await self._generate_text(prompt, _SENTIMENT_CONFIG, self.fallback_model)
+                sentiment_data = _parse_sentiment(response_text)
+                route = "fallback"
+            
+            return self._finish_sentiment(token_symbol, sentiment_data, response_text,
+                                          route, time.perf_counter() - request_start)
+        except Exception as e:
+            return self._error_sentiment(token_symbol, e)
+    
+    def _analyze_token_sentiment_sync(self, token_symbol: str, token_name: str,
+                                      market_data: Dict, verified_data=None) -> Dict:
+        """Blocking twin of _analyze_token_sentiment, using the sync Gemini client"""
+        try:
+            request_start = time.perf_counter()
+            prompt = self._build_prompt(token_symbol, token_name, market_data, verified_data)
+            
+            response_text = self._generate_text_sync(prompt, _SENTIMENT_CONFIG)
+            sentiment_data = _parse_sentiment(response_text)
+            route = "primary"
+            
+            if sentiment_data is None and self.fallback_model is not None:
+                self._log_fallback(token_symbol)
+                response_text = self._generate_text_sync(prompt, _SENTIMENT_CONFIG, self.fallback_model)
+                sentiment_data = _parse_sentiment(response_text)
+                route = "fallback"
+            
+            return self._finish_sentiment(token_symbol, sentiment_data, response_text,
+                                          route, time.perf_counter() - request_start)
+        except Exception as e:
+            return self._error_sentiment(token_symbol, e)
+    
+    @staticmethod
+    def _build_prompt(token_symbol: str, token_name: str, market_data: Dict, verified_data) -> str:
+        """Single-token sentiment prompt"""
+        logger.debug("[Gemini API] Sentiment call for %s - price: $%.4f, 24h: %.2f%%", token_symbol,
+                     market_data.get('price', 0), market_data.get('percent_change_24h', 0))
+        
+        # Static instructions first so repeated calls share a cacheable prompt prefix
+        prompt = f"{PROMPT_HEAD}\nAnalyze the sentiment for this token:\n\n{_market_block(token_symbol, token_name, market_data)}"
+        
+        # If FDC verification available, include it in analysis
+        if verified_data and verified_data.verified:
+            prompt += (
+                "\nNOTE: This data has been cryptographically verified by Flare Data Connector (FDC).\n"
+                f"Verification Hash: {verified_data.hash[:16]}...\n"
+                "Data is attestation-backed and tamper-proof.\n"
+            )
+        return prompt
+    
+    def _log_fallback(self, token_symbol: str):
+        logger.warning("[Gemini API] %s answer from %s was invalid, retrying with %s", token_symbol,
+                       self.model.model_name, self.fallback_model.model_name)
+    
+    def _finish_sentiment(self, token_symbol: str, sentiment_data: Optional[Dict],
+                          response_text: str, route: str, request_time: float) -> Dict:
+        """
+        Final sentiment result for one Gemini answer, without fdc_* fields
+        
+        The result is cached and shared by requests with different FDC data,
+        so verification metadata is added per request by _with_fdc_metadata.
+        
+        Args:
+            sentiment_data: Validated answer, or None to fall back to keyword scoring of response_text
+            route: "primary" or "fallback" - the model that produced response_text
+            request_time: Seconds spent on Gemini calls
+        """
+        with self._state_lock:
+            self.model_routes[route] += 1
+        
+        if sentiment_data is not None:
+            logger.info("[Gemini API] %s sentiment in %.2fs (%s model) - score: %s, risk: %s", token_symbol,
+                        request_time, route, sentiment_data['overall_sentiment'], sentiment_data['risk_level'])
+            return sentiment_data
+        
+        # Fallback parsing
+        logger.warning("[Gemini API] %s answer in %.2fs was not valid, using keyword fallback",
+                       token_symbol, request_time)
+        sentiment_score = self._extract_sentiment_from_text(response_text)
+        
+        return {
+            "overall_sentiment": sentiment_score,
+            "short_term_sentiment": sentiment_score,
+            "medium_term_sentiment": sentiment_score,
+            "key_factors": ["Price momentum", "Market conditions"],
+            "risk_level": "Medium",
+            "reasoning": "Automated analysis based on market data"
+        }
+    
+    @staticmethod
+    def _error_sentiment(token_symbol: str, e: Exception) -> Dict:
+        """Neutral result for a failed analysis (risk_level "Unknown", never cached)"""
+        logger.error("[Gemini API] Sentiment analysis for %s failed: %s", token_symbol, e)
+        return {
+            "overall_sentiment": 0.0,
+            "short_term_sentiment": 0.0,
+            "medium_term_sentiment": 0.0,
+            "key_factors": [],
+            "risk_level": "Unknown",
+            "reasoning": f"Error: {str(e)}",
+            "fdc_verified": False,
+            "fdc_hash": None,
+            "fdc_timestamp": None
+        }
+    
+    async def analyze_many(self, items: List[Tuple[str, str, Dict, object]],
+                           max_concurrency: int = 16) -> List:
+        """
+        Analyze sentiment for several tokens concurrently, one Gemini call each
+        
+        Prefer this over awaiting analyze_token_sentiment inside a loop, which waits
+        out each round trip before starting the next one: here every call is in
+        flight at once (up to max_concurrency), so wall time is roughly the slowest
+        call rather than the sum of all of them.
+        
+        Args:
+            items: List of (token_symbol, token_name, market_data, verified_data) tuples
+            max_concurrency: Most Gemini calls in flight at once
+            
+        Returns:
+            List of sentiment analysis dicts, in the same order as items (an
+            exception instance in place of a token whose analysis raised)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze(item):
+            async with semaphore:
+                return await self.analyze_token_sentiment(*item)
+        
+        tasks = [asyncio.create_task(analyze(item)) for item in items]
+        return list(await asyncio.gather(*tasks, return_exceptions=True))
+    
+    def analyze_many_sync(self, items: List[Tuple[str, str, Dict, object]],
+                          workers: int = 16) -> List[Dict]:
+        """
+        Blocking analyze_many for sync callers - one worker thread per in-flight call
+        
+        The calls are network-bound and release the GIL while waiting, so threads
+        overlap them just like the async fan-out. The model and its pooled client
+        are shared by all threads; cache and stats updates are serialized by
+        _state_lock and the rate limiter still applies.
+        
+        Args:
+            items: List of (token_symbol, token_name, market_data, verified_data) tuples
+            workers: Most Gemini calls in flight at once
+            
+        Returns:
+            List of sentiment analysis dicts, in the same order as items
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda item: self.analyze_token_sentiment_sync(*item), items))
+    
+    async def analyze_batch(self, items: List[Tuple[str, str, Dict, object]]) -> List[Dict]:
+        """
+        Analyze sentiment for several tokens with a single Gemini request
+        
+        The batched answer is keyed by symbol, so a symbol is sent once; repeats
+        with different market data, and tokens the answer misses, are analyzed
+        with single calls, concurrently.
+        
+        Args:
+            items: List of (token_symbol, token_name, market_data, verified_data) tuples
+            
+        Returns:
+            List of sentiment analysis dicts, in the same order as items
+        """
+        # Tokens with a fresh cached answer (or an extreme move) are left out of the batched prompt
+        verified = [bool(verified_data and verified_data.verified) for *_, verified_data in items]
+        keys = [_bucket_key(item[0], item[2], is_verified) for item, is_verified in zip(items, verified)]
+        cached = [_fast_path(item[2]) or self._cache_get(key, item[0], item[2], is_verified)
+                  for item, key, is_verified in zip(items, keys, verified)]
+        
+        # {token_symbol: bucket key} of the item each symbol is batched for
+        batch_keys: Dict[str, bytes] = {}
+        misses = []
+        for item, key, hit in zip(items, keys, cached):
+            if hit is None and item[0] not in batch_keys:
+                batch_keys[item[0]] = key
+                misses.append(item)
+        
+        if len(misses) <= 1:
+            return list(await asyncio.gather(*(self.analyze_token_sentiment(*item) for item in items)))
+        
+        hits = sum(hit is not None for hit in cached)
+        self._count(hits=hits, misses=len(items) - hits)
+        
+        # Larger batches are split so each answer stays well inside the output budget
+        chunks = [misses[i:i + self.BATCH_MAX_TOKENS] for i in range(0, len(misses), self.BATCH_MAX_TOKENS)]
+        batch_data = {}
+        for answer in await asyncio.gather(*(self._generate_batch(chunk) for chunk in chunks)):
+            batch_data.update(answer)
+        
+        results: List[Optional[Dict]] = [None] * len(items)
+        fallbacks = []
+        for i, (item, key, is_verified, hit) in enumerate(zip(items, keys, verified, cached)):
+            token_symbol, token_name, market_data, verified_data = item
+            if hit is not None:
+                results[i] = _with_fdc_metadata(hit, verified_data)
+                continue
+            
+            sentiment_data = batch_data.get(token_symbol) if batch_keys[token_symbol] == key else None
+            if not _is_valid_sentiment(sentiment_data):
+                # Not answered by the batch (missing, invalid or another snapshot of a batched symbol)
+                fallbacks.append(i)
+                continue
+            
+            # Cache, then add verification metadata
+            self._cache_put(key, token_symbol, market_data, is_verified, sentiment_data)
+            results[i] = _with_fdc_metadata(sentiment_data, verified_data)
+        
+        answers = await asyncio.gather(*(self.analyze_token_sentiment(*items[i]) for i in fallbacks))
+        for i, answer in zip(fallbacks, answers):
+            results[i] = answer
+        return results
+    
+    async def _generate_batch(self, items: List[Tuple[str, str, Dict, object]]) -> Dict:
+        """
+        Ask Gemini for the sentiment of several tokens in one prompt
+        
+        Args:
+            items: List of (token_symbol, token_name, market_data, verified_data) tuples
+            
+        Returns:
+            Dict of token_symbol -> sentiment data ({} if the call or parsing failed)
+        """
         try:
-            import time
-            request_start = time.time()
-            print(f"[Gemini API] Making sentiment analysis call for {token_symbol} at {datetime.now().isoformat()}")
-            print(f"[Gemini API] Market data - Price: ${market_data.get('price', 0):.4f}, 24h: {market_data.get('percent_change_24h', 0):.2f}%")
-            
-            # If FDC verification available, include it in analysis
-            verification_context = ""
-            if verified_data and verified_data.verified:
-                verification_context = f"""
-                NOTE: This data has been cryptographically verified by Flare Data Connector (FDC).
-                Verification Hash: {verified_data.hash[:16]}...
-                Data is attestation-backed and tamper-proof.
-                """
-            
-            # Create a comprehensive prompt for sentiment analysis
-            prompt = f"""
-            Analyze the sentiment for {token_name} ({token_symbol}) based on the following market data:
-            
-            Current Price: ${market_data.get('price', 0):,.2f}
-            1h Change: {market_data.get('percent_change_1h', 0):.2f}%
-            24h Change: {market_data.get('percent_change_24h', 0):.2f}%
-            7d Change: {market_data.get('percent_change_7d', 0):.2f}%
-            Market Cap: ${market_data.get('market_cap', 0):,.0f}
-            24h Volume: ${market_data.get('volume_24h', 0):,.0f}
-            
-            {verification_context}
-            
-            Based on this data, provide:
-            1. Overall sentiment score (-100 to +100, where -100 is very bearish, +100 is very bullish)
-            2. Short-term sentiment (next 1-4 hours)
-            3. Medium-term sentiment (next 24 hours)
-            4. Key factors influencing the sentiment
-            5. Risk assessment (Low/Medium/High)
-            
-            Respond ONLY with a valid JSON object (no markdown, no extra text) in this exact format:
-            {{
-                "overall_sentiment": <number>,
-                "short_term_sentiment": <number>,
-                "medium_term_sentiment": <number>,
-                "key_factors": ["factor1", "factor2"],
-                "risk_level": "Low|Medium|High",
-                "reasoning": "brief explanation"
-            }}
-            """
-            
-            # Generate content with Gemini
-            response = self.model.generate_content(prompt)
-            
-            request_time = time.time() - request_start
-            print(f"[Gemini API] Response received in {request_time:.2f}s", end="")
-            
-            # Extract JSON from response
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            # Parse JSON
+            logger.debug("[Gemini API] Batched sentiment call for %d tokens", len(items))
+            
+            token_sections = "\n".join(
+                _market_block(token_symbol, token_name, market_data)
+                for token_symbol, token_name, market_data, _ in items
+            )
+            prompt = f"{BATCH_PROMPT_HEAD}\nAnalyze the sentiment for each of these tokens:\n\n{token_sections}"
+            
+            batch_config = _batch_config([token_symbol for token_symbol, *_ in items])
+            batch_data = orjson.loads(await self._generate_text(prompt, batch_config))
+        except Exception as e:
+            logger.warning("[Gemini API] Batched call failed (%s), analyzing tokens individually", e)
+            return {}
+        
+        return batch_data if isinstance(batch_data, dict) else {}
+    
+    async def _generate_text(self, prompt: str, generation_config: genai.GenerationConfig,
+                             model: Optional[genai.GenerativeModel] = None) -> str:
+        """
+        Stream a Gemini JSON response and return its text
+        
+        Calls go through the rate limiter; a 429 (ResourceExhausted) is retried
+        with exponential backoff and jitter.
+        
+        Args:
+            prompt: Prompt to send
+            generation_config: Structured-output config (JSON mime type and schema)
+            model: Model to call (defaults to the primary model)
+            
+        Returns:
+            Response text, ready for orjson.loads
+        """
+        # Async clients belong to the running loop, so look up the model bound to it
+        async_model = _get_async_model(self.api_key, (model or self.model).model_name)
+        for attempt in range(self.GEMINI_MAX_RETRIES + 1):
+            await self._limiter.acquire()
             try:
-                sentiment_data = json.loads(response_text)
-                print(f" - Sentiment: {sentiment_data.get('overall_sentiment', 0):.2f}, Risk: {sentiment_data.get('risk_level', 'Unknown')}")
-                
-                # Add verification metadata
-                if verified_data:
-                    sentiment_data["fdc_verified"] = verified_data.verified
-                    sentiment_data["fdc_hash"] = verified_data.hash
-                    sentiment_data["fdc_timestamp"] = verified_data.timestamp
-                else:
-                    sentiment_data["fdc_verified"] = False
-                    sentiment_data["fdc_hash"] = None
-                    sentiment_data["fdc_timestamp"] = None
-                
-                return sentiment_data
-                
-            except json.JSONDecodeError:
-                # Fallback parsing
-                print(f" - Failed to parse JSON, using fallback")
-                sentiment_score = self._extract_sentiment_from_text(response_text)
+                response = await async_model.generate_content_async(
+                    prompt, stream=True, generation_config=generation_config)
                 
-                return {
-                    "overall_sentiment": sentiment_score,
-                    "short_term_sentiment": sentiment_score,
-                    "medium_term_sentiment": sentiment_score,
-                    "key_factors": ["Price momentum", "Market conditions"],
-                    "risk_level": "Medium",
-                    "reasoning": "Automated analysis based on market data",
-                    "fdc_verified": verified_data.verified if verified_data else False,
-                    "fdc_hash": verified_data.hash if verified_data else None,
-                    "fdc_timestamp": verified_data.timestamp if verified_data else None
-                }
-                
-        except Exception as e:
-            print(f"Error in sentiment analysis: {e}")
+                buf = bytearray()
+                async for chunk in response:
+                    buf += chunk.text.encode()
+                self._record_usage(response.usage_metadata)
+                break
+            except ResourceExhausted:
+                if attempt == self.GEMINI_MAX_RETRIES:
+                    raise
+                delay = min(8.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning("[Gemini API] Rate limited, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+        
+        return buf.decode()
+    
+    def _generate_text_sync(self, prompt: str, generation_config: genai.GenerationConfig,
+                            model: Optional[genai.GenerativeModel] = None) -> str:
+        """Blocking _generate_text (one unary call, same rate limit and retries)"""
+        for attempt in range(self.GEMINI_MAX_RETRIES + 1):
+            self._limiter.acquire_sync()
+            try:
+                response = (model or self.model).generate_content(prompt, generation_config=generation_config)
+                self._record_usage(response.usage_metadata)
+                return response.text
+            except ResourceExhausted:
+                if attempt == self.GEMINI_MAX_RETRIES:
+                    raise
+                delay = min(8.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning("[Gemini API] Rate limited, retrying in %.1fs", delay)
+                time.sleep(delay)
+    
+    def _record_usage(self, usage):
+        """Add one response's usage_metadata to token_stats"""
+        prompt_tokens = usage.prompt_token_count
+        cached_tokens = usage.cached_content_token_count
+        with self._state_lock:
+            self.token_stats["calls"] += 1
+            self.token_stats["prompt_tokens"] += prompt_tokens
+            self.token_stats["cached_tokens"] += cached_tokens
+            self.token_stats["completion_tokens"] += usage.candidates_token_count
+        logger.debug("[Gemini API] Tokens - prompt: %d (cached: %d), completion: %d",
+                     prompt_tokens, cached_tokens, usage.candidates_token_count)
+    
+    def get_stats(self) -> Dict:
+        """
+        Cache and token usage counters for this analyzer
+        
+        Returns:
+            Dict of cache hits/misses, disk cache hits, answers per model route and Gemini token totals,
+            with cached_ratio the share of prompt tokens served from Gemini's cache
+        """
+        with self._state_lock:
+            prompt_tokens = self.token_stats["prompt_tokens"]
             return {
-                "overall_sentiment": 0.0,
-                "short_term_sentiment": 0.0,
-                "medium_term_sentiment": 0.0,
-                "key_factors": [],
-                "risk_level": "Unknown",
-                "reasoning": f"Error: {str(e)}",
-                "fdc_verified": False,
-                "fdc_hash": None,
-                "fdc_timestamp": None
+                "cache_hits": self._cache_hits,
+                "cache_misses": self._cache_misses,
+                "disk_hits": self._disk_hits,
+                **self.token_stats,
+                "model_routes": dict(self.model_routes),
+                "cached_ratio": self.token_stats["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
             }
     
+    async def close(self):
+        """
+        Release this analyzer's Gemini clients
+        
+        The clients are shared with other analyzers for the same key; their
+        connections are closed only when the last of them is released. The
+        analyzer must not be used afterwards.
+        """
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+        if not self._holds_clients:
+            return
+        self._holds_clients = False
+        clients = _release_clients(self.api_key)
+        if clients is not None:
+            client, loops = clients
+            client.transport.close()
+            # Channels of other loops can't be awaited from here; they go with their loop
+            per_loop = loops.get(asyncio.get_running_loop())
+            if per_loop is not None:
+                await per_loop[0].transport.close()
+    
     def _extract_sentiment_from_text(self, text: str) -> float:
         """Extract sentiment score from text response (fallback)"""
-        # Simple keyword-based sentiment extraction
-        positive_keywords = ['bullish', 'positive', 'strong', 'growth', 'upward']
-        negative_keywords = ['bearish', 'negative', 'weak', 'decline', 'downward']
-        
+        # Simple keyword-based sentiment extraction (one regex scan per polarity)
         text_lower = text.lower()
-        pos_count = sum(1 for kw in positive_keywords if kw in text_lower)
-        neg_count = sum(1 for kw in negative_keywords if kw in text_lower)
+        pos_count = len(_POS_RE.findall(text_lower))
+        neg_count = len(_NEG_RE.findall(text_lower))
         
         if pos_count > neg_count:
             return 50.0
@@ -177,9 +1046,87 @@ class SentimentAnalyzer:
         score = overall_sentiment
         
         # Generate recommendation (sentiment-based with low thresholds)
-        if score > 5:
+        if score > self.RECOMMENDATION_THRESHOLD:
             return "LONG"
-        elif score < -5:
+        elif score < -self.RECOMMENDATION_THRESHOLD:
             return "SHORT"
         else:
             return "HOLD"
+    
+    def recommend_batch(self, overall_sentiment: Sequence[float]) -> np.ndarray:
+        """
+        Vectorized get_trading_recommendation over many tokens (e.g. a screener)
+        
+        Args:
+            overall_sentiment: overall_sentiment score of each token
+            
+        Returns:
+            Array of "LONG" / "SHORT" / "HOLD", one per token
+        """
+        score = np.asarray(overall_sentiment, dtype=np.float64)
+        return np.select(
+            [score > self.RECOMMENDATION_THRESHOLD, score < -self.RECOMMENDATION_THRESHOLD],
+            ["LONG", "SHORT"],
+            "HOLD"
+        )
+
+
+class SentimentBatcher:
+    """
+    Micro-batches concurrent sentiment requests into a single Gemini call
+    
+    Requests arriving within max_latency_ms of each other (up to max_batch_size)
+    are collected from a queue and sent to SentimentAnalyzer.analyze_batch together.
+    """
+    
+    def __init__(self, analyzer: SentimentAnalyzer, max_batch_size: int = 8,
+                 max_latency_ms: int = 20):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def analyze_token_sentiment(self, token_symbol: str, token_name: str,
+                                      market_data: Dict, verified_data=None) -> Dict:
+        """
+        Queue a sentiment request and wait for its batched result
+        
+        Same signature as SentimentAnalyzer.analyze_token_sentiment
+        """
+        if self._worker is None or self._worker.done():
+            self.queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((token_symbol, token_name, market_data, verified_data, future))
+        return await future
+    
+    async def _run(self):
+        """Background task that drains the queue in batches"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_latency
+            
+            # Collect more requests until the batch is full or the window closes
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            futures = [item[4] for item in batch]
+            try:
+                results = await self.analyzer.analyze_batch([item[:4] for item in batch])
+                for future, result in zip(futures, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
@@ -0,0 +1,8 @@
+"""
+Shared test setup - backend modules import each other as top-level modules
+(e.g. `from rule_compiler import ...`), so the backend directory goes on sys.path
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
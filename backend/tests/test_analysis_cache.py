@@ -0,0 +1,105 @@
+"""
+Regression tests for the /api/analyze response cache in app_flare: key
+normalization, fallback results, singleflight and the size bound
+"""
+import asyncio
+import importlib
+import os
+
+import pytest
+
+# app_flare builds its clients at import; keep that offline
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("FLARE_RPC_URL", "http://127.0.0.1:9")
+
+
+@pytest.fixture
+def app_flare():
+    module = importlib.import_module("app_flare")
+    if not module.CACHE_ENABLED:
+        pytest.skip("analysis cache disabled in config")
+    module.analysis_cache.clear()
+    module.analysis_inflight.clear()
+    return module
+
+
+@pytest.fixture
+def runs(app_flare, monkeypatch):
+    """Replace the upstream pipeline; returns the (token, stablecoin, risk_level) of each run"""
+    calls = []
+    
+    async def fake_run_analysis(request):
+        calls.append((request.token, request.stablecoin, request.risk_level))
+        await asyncio.sleep(0.01)
+        response = app_flare.AnalysisResponse(
+            token=request.token, signal="HOLD", confidence=0.6, ftso_price=1.0,
+            sentiment_score=0.0, verified=True, fdc_verified=True,
+            contract_verified=None, verification_hash=None, timestamp="t"
+        )
+        # portfolio_amount 0 stands in for a result built from fallback data
+        return response, request.portfolio_amount > 0
+    
+    monkeypatch.setattr(app_flare, "run_analysis", fake_run_analysis)
+    return calls
+
+
+def _request(module, token="BTC", stablecoin="USDC", risk_level="moderate", amount=100.0):
+    return module.AnalysisRequest(token=token, stablecoin=stablecoin,
+                                  portfolio_amount=amount, risk_level=risk_level)
+
+
+def test_token_and_options_are_normalized(app_flare, runs):
+    async def scenario():
+        first = await app_flare.analyze_token(_request(app_flare, " btc", "usdc", "Moderate"))
+        second = await app_flare.analyze_token(_request(app_flare, "BTC"))
+        return first, second
+    
+    first, second = asyncio.run(scenario())
+    assert len(runs) == 1
+    assert first is second
+    assert first.token == "BTC"
+    assert list(app_flare.analysis_cache) == [("BTC", "USDC", "moderate")]
+
+
+def test_distinct_options_get_distinct_entries(app_flare, runs):
+    async def scenario():
+        await app_flare.analyze_token(_request(app_flare, "BTC"))
+        await app_flare.analyze_token(_request(app_flare, "ETH"))
+        await app_flare.analyze_token(_request(app_flare, "BTC", stablecoin="USDT"))
+        await app_flare.analyze_token(_request(app_flare, "BTC", risk_level="aggressive"))
+    
+    asyncio.run(scenario())
+    assert len(runs) == 4
+    assert len(app_flare.analysis_cache) == 4
+
+
+def test_fallback_results_are_not_cached(app_flare, runs):
+    async def scenario():
+        await app_flare.analyze_token(_request(app_flare, amount=0))
+        await app_flare.analyze_token(_request(app_flare, amount=0))
+    
+    asyncio.run(scenario())
+    assert len(runs) == 2
+    assert app_flare.analysis_cache == {}
+
+
+def test_concurrent_misses_share_one_run(app_flare, runs):
+    async def scenario():
+        return await asyncio.gather(*(app_flare.analyze_token(_request(app_flare, token))
+                                      for token in ("btc", "BTC", " Btc ")))
+    
+    responses = asyncio.run(scenario())
+    assert len(runs) == 1
+    assert all(response is responses[0] for response in responses)
+    assert app_flare.analysis_inflight == {}
+
+
+def test_cache_is_bounded(app_flare, runs, monkeypatch):
+    monkeypatch.setattr(app_flare, "ANALYSIS_CACHE_MAX_ENTRIES", 2)
+    
+    async def scenario():
+        for token in ("BTC", "ETH", "SOL"):
+            await app_flare.analyze_token(_request(app_flare, token))
+    
+    asyncio.run(scenario())
+    assert [key[0] for key in app_flare.analysis_cache] == ["ETH", "SOL"]
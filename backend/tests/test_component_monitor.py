@@ -0,0 +1,140 @@
+"""
+Regression tests for health check caching: per-token TTL, error reporting,
+stale last-good data and the circuit breaker
+"""
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from component_monitor import FtsoHealthChecker, HealthCheckCoordinator
+
+
+class FakeFeed:
+    """FTSO feed stand-in returning a fixed price per token, or raising"""
+    
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+        self.error = None
+    
+    async def get_price(self, token):
+        self.calls.append(token)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(price=self.prices[token], timestamp=1)
+
+
+def _expire(checker):
+    """Age every cached probe past the checker's TTL"""
+    for key in checker._checked_at:
+        checker._checked_at[key] -= checker.ttl_s + 1
+
+
+@pytest.fixture
+def setup():
+    feed = FakeFeed({"BTC": 60000.0, "ETH": 3000.0})
+    checker = FtsoHealthChecker(feed)
+    return feed, checker, HealthCheckCoordinator([checker])
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_status_is_cached_per_token(setup):
+    feed, checker, coordinator = setup
+    
+    async def scenario():
+        btc = await coordinator.run_check(checker.key, "BTC")
+        eth = await coordinator.run_check(checker.key, "ETH")
+        btc_again = await coordinator.run_check(checker.key, "btc")
+        return btc, eth, btc_again
+    
+    btc, eth, btc_again = run(scenario())
+    assert feed.calls == ["BTC", "ETH"]
+    assert btc.metadata["price"] == 60000.0
+    assert eth.metadata["price"] == 3000.0
+    assert btc_again is btc and btc_again.metadata["price"] == 60000.0
+
+
+def test_expired_ttl_probes_again(setup):
+    feed, checker, coordinator = setup
+    
+    async def scenario():
+        await coordinator.run_check(checker.key, "BTC")
+        await coordinator.run_check(checker.key, "BTC")
+        _expire(checker)
+        await coordinator.run_check(checker.key, "BTC")
+    
+    run(scenario())
+    assert feed.calls == ["BTC", "BTC"]
+
+
+def test_failure_reports_error_with_stale_last_good(setup):
+    feed, checker, coordinator = setup
+    
+    async def scenario():
+        await coordinator.run_check(checker.key, "BTC")
+        feed.error = RuntimeError("rpc down")
+        _expire(checker)
+        return await coordinator.check_all("BTC")
+    
+    result = run(scenario())
+    status = result["components"][checker.key]
+    assert status["status"] == "error"
+    assert status["metadata"] == {}
+    assert "rpc down" in status["error_message"]
+    assert status["last_good"]["price"] == 60000.0
+    assert status["last_good"]["stale"] is True
+    assert result["overall"] == "critical"
+
+
+def test_last_good_expires_after_stale_max_age(setup):
+    feed, checker, coordinator = setup
+    
+    async def scenario():
+        component = await coordinator.run_check(checker.key, "BTC")
+        component.last_success -= timedelta(seconds=checker.stale_max_age_s + 1)
+        feed.error = RuntimeError("rpc down")
+        _expire(checker)
+        return await coordinator.run_check(checker.key, "BTC")
+    
+    component = run(scenario())
+    assert component.status == "error"
+    assert component.last_good is None
+
+
+def test_recovery_clears_last_good(setup):
+    feed, checker, coordinator = setup
+    
+    async def scenario():
+        await coordinator.run_check(checker.key, "BTC")
+        feed.error = RuntimeError("rpc down")
+        _expire(checker)
+        await coordinator.run_check(checker.key, "BTC")
+        feed.error = None
+        _expire(checker)
+        return await coordinator.run_check(checker.key, "BTC")
+    
+    component = run(scenario())
+    assert component.status == "healthy"
+    assert component.last_good is None
+    assert component.consecutive_failures == 0
+
+
+def test_open_circuit_serves_last_status_without_probing(setup):
+    feed, checker, coordinator = setup
+    feed.error = RuntimeError("rpc down")
+    
+    async def scenario():
+        for _ in range(checker.failure_threshold):
+            await coordinator.run_check(checker.key, "BTC")
+            _expire(checker)
+        return await coordinator.run_check(checker.key, "BTC")
+    
+    component = run(scenario())
+    assert len(feed.calls) == checker.failure_threshold
+    assert component.status == "error"
+    assert component.consecutive_failures == checker.failure_threshold
@@ -0,0 +1,65 @@
+"""
+Regression tests: calculate_signals_batch must agree with calculate_signal
+"""
+import numpy as np
+import pytest
+
+from decision_engine import DecisionEngine
+
+# (overall, short_term, change_24h, change_1h, onchain, risk_level)
+CASES = [
+    (0, 0, 0, 0, 0, "Medium"),
+    (40, 20, 3.5, 0.8, 10, "Low"),
+    (-60, -80, -12.0, -2.5, -5, "High"),
+    (1.2, -0.5, 0.1, -0.2, 0, "Medium"),
+    (-1, 1, 0.3, 0.3, 0.5, "High"),
+    (100, 100, 50, 20, 100, "Low"),
+    (5, 5, -1, 1, 0, "Unknown"),
+]
+
+
+@pytest.fixture
+def engine():
+    return DecisionEngine()
+
+
+def _scalar(engine, case):
+    overall, short_term, change_24h, change_1h, onchain, risk_level = case
+    return engine.calculate_signal(
+        {"percent_change_24h": change_24h, "percent_change_1h": change_1h},
+        {"overall_sentiment": overall, "short_term_sentiment": short_term, "risk_level": risk_level},
+        {"onchain_signal": onchain},
+    )
+
+
+def test_batch_matches_scalar(engine):
+    batch = engine.calculate_signals_batch(*(list(column) for column in zip(*CASES)))
+    
+    for i, case in enumerate(CASES):
+        signal = _scalar(engine, case)
+        assert batch["recommendation"][i] == signal["recommendation"], case
+        assert batch["confidence"][i] == pytest.approx(signal["confidence"]), case
+        assert batch["final_score"][i] == pytest.approx(signal["final_score"]), case
+        assert batch["market_momentum"][i] == pytest.approx(signal["signal_breakdown"]["market_momentum"]), case
+
+
+def test_batch_matches_scalar_on_random_inputs(engine):
+    rng = np.random.default_rng(0)
+    n = 500
+    columns = (
+        rng.uniform(-100, 100, n), rng.uniform(-100, 100, n),
+        rng.uniform(-30, 30, n), rng.uniform(-5, 5, n),
+        rng.uniform(-50, 50, n), rng.choice(["Low", "Medium", "High"], n),
+    )
+    batch = engine.calculate_signals_batch(*columns)
+    
+    for i, case in enumerate(zip(*columns)):
+        signal = _scalar(engine, tuple(case))
+        assert batch["recommendation"][i] == signal["recommendation"]
+        assert batch["final_score"][i] == pytest.approx(signal["final_score"])
+        assert batch["confidence"][i] == pytest.approx(signal["confidence"])
+
+
+def test_empty_batch(engine):
+    batch = engine.calculate_signals_batch([], [], [], [], [], [])
+    assert all(len(values) == 0 for values in batch.values())
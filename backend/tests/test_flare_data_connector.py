@@ -0,0 +1,128 @@
+"""
+Regression tests for FlareDataConnector response caching and batch fallback
+"""
+import asyncio
+import time
+
+import pytest
+
+from flare_data_connector import FlareDataConnector, VerifiedData
+
+
+def _verified(symbol, kind="sentiment"):
+    return VerifiedData(content={"symbol": symbol}, hash="ab" * 32, timestamp=int(time.time()),
+                        proof="p" * 64, verified=True, source_id=FlareDataConnector.SOURCE_IDS[kind])
+
+
+@pytest.fixture
+def fdc():
+    return FlareDataConnector(fdc_endpoint="http://fdc.invalid")
+
+
+def test_concurrent_misses_share_one_fetch(fdc):
+    calls = []
+    
+    async def fetch(symbol):
+        calls.append(symbol)
+        await asyncio.sleep(0.01)
+        return _verified(symbol)
+    
+    async def scenario():
+        results = await asyncio.gather(*(fdc._get_cached("sentiment", "BTC", fetch) for _ in range(10)))
+        cached = await fdc._get_cached("sentiment", "BTC", fetch)
+        return results, cached
+    
+    results, cached = asyncio.run(scenario())
+    assert calls == ["BTC"]
+    assert all(result is results[0] for result in results)
+    assert cached is results[0]
+    assert fdc._inflight == {}
+
+
+def test_fallback_results_are_not_cached(fdc):
+    calls = []
+    
+    async def fetch(symbol):
+        calls.append(symbol)
+        return fdc._create_fallback_data(symbol, "sentiment")
+    
+    async def scenario():
+        await fdc._get_cached("sentiment", "BTC", fetch)
+        await fdc._get_cached("sentiment", "BTC", fetch)
+    
+    asyncio.run(scenario())
+    assert calls == ["BTC", "BTC"]
+    assert fdc._cache == {}
+    assert fdc._inflight == {}
+
+
+def test_unique_symbols_leave_no_inflight_entries(fdc):
+    async def fetch(symbol):
+        return fdc._create_fallback_data(symbol, "sentiment")
+    
+    async def scenario():
+        await asyncio.gather(*(fdc._get_cached("sentiment", f"TOKEN{i}", fetch) for i in range(100)))
+    
+    asyncio.run(scenario())
+    assert fdc._inflight == {}
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    closed = False
+    
+    def __init__(self, status):
+        self.status = status
+        self.posts = []
+    
+    def post(self, url, json=None):
+        self.posts.append(url)
+        return _Response(self.status)
+
+
+def _per_type_fetchers(fdc, monkeypatch, calls):
+    for kind in FlareDataConnector.REQUEST_SPECS:
+        async def fetch(symbol, kind=kind):
+            calls.append(kind)
+            return _verified(symbol, kind)
+        monkeypatch.setattr(fdc, f"_fetch_verified_{kind}", fetch)
+
+
+def test_batch_endpoint_is_off_by_default(monkeypatch):
+    session = _Session(200)
+    fdc = FlareDataConnector(fdc_endpoint="http://fdc.invalid", session=session)
+    calls = []
+    _per_type_fetchers(fdc, monkeypatch, calls)
+    
+    results = asyncio.run(fdc.fetch_batch("BTC"))
+    assert session.posts == []
+    assert sorted(calls) == ["news", "price", "sentiment"]
+    assert all(result.verified for result in results.values())
+
+
+def test_missing_batch_endpoint_falls_back_and_is_remembered(monkeypatch):
+    session = _Session(404)
+    fdc = FlareDataConnector(fdc_endpoint="http://fdc.invalid", session=session, batch_endpoint=True)
+    calls = []
+    _per_type_fetchers(fdc, monkeypatch, calls)
+    
+    async def scenario():
+        first = await fdc.fetch_batch("BTC")
+        second = await fdc.fetch_batch("ETH")
+        return first, second
+    
+    first, second = asyncio.run(scenario())
+    assert session.posts == ["http://fdc.invalid/api/v1/batch"]
+    assert len(calls) == 6
+    assert first["price"].content == {"symbol": "BTC"}
+    assert second["news"].content == {"symbol": "ETH"}
@@ -0,0 +1,94 @@
+"""
+Regression tests for FTSOPriceFeed price caching and batched reads
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from eth_abi import encode
+
+from ftso_price_feed import FTSOPriceFeed
+
+
+@pytest.fixture
+def feed():
+    return FTSOPriceFeed(rpc_url="http://127.0.0.1:9")
+
+
+def _fake_fetch(feed, calls):
+    async def fetch_price(symbol):
+        calls.append(symbol)
+        await asyncio.sleep(0.01)
+        return feed._to_ftso_price(symbol, 6_000_000_000, 1)
+    return fetch_price
+
+
+def test_concurrent_misses_share_one_lookup(feed, monkeypatch):
+    calls = []
+    monkeypatch.setattr(feed, "_fetch_price", _fake_fetch(feed, calls))
+    
+    async def scenario():
+        return await asyncio.gather(*(feed.get_price(symbol) for symbol in ("BTC", "BTC/USD", "btc", "BTC")))
+    
+    prices = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [price.symbol for price in prices] == ["BTC", "BTC/USD", "btc", "BTC"]
+    assert all(price.price == 60000.0 for price in prices)
+    assert feed._inflight == {}
+
+
+def test_unknown_symbols_leave_no_locks_and_cache_is_bounded(feed, monkeypatch):
+    monkeypatch.setattr(feed, "PRICE_CACHE_MAX_ENTRIES", 8)
+    
+    async def scenario():
+        return await asyncio.gather(*(feed.get_price(f"UNKNOWN{i}") for i in range(50)))
+    
+    prices = asyncio.run(scenario())
+    assert all(price.provider == "FTSO_FALLBACK" for price in prices)
+    assert feed._inflight == {}
+    assert len(feed._price_cache) == 8
+
+
+class _FakeMulticall:
+    """Multicall3 contract stand-in answering aggregate3 with canned results"""
+    
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+        self.functions = self
+    
+    def aggregate3(self, calls):
+        self.calls.append(calls)
+        return self
+    
+    async def call(self):
+        return self.results
+
+
+def test_prefetch_decodes_multicall_results_and_skips_failures(feed):
+    reader = "0x" + "11" * 20
+    multicall = _FakeMulticall([
+        (True, encode(["uint256", "uint256"], [6_400_000_000, 1_700_000_000])),
+        (False, b""),
+        (True, encode(["uint256", "uint256"], [250_000, 1_700_000_001])),
+    ])
+    feed.price_reader = SimpleNamespace(address=reader)
+    feed.multicall = multicall
+    
+    asyncio.run(feed._prefetch_prices(["BTC", "ETH", "XRP", "btc", "UNKNOWN"]))
+    
+    # One call per known, distinct pair, all aimed at the price reader
+    (calls,) = multicall.calls
+    assert [call[2] for call in calls] == [feed._price_calldata[asset_id] for asset_id in (1, 2, 3)]
+    assert all(call[:2] == (reader, True) for call in calls)
+    
+    btc = feed._price_cache[feed._normalize_symbol("BTC")][1]
+    xrp = feed._price_cache[feed._normalize_symbol("XRP")][1]
+    assert (btc.price, btc.timestamp) == (64000.0, 1_700_000_000)
+    assert (xrp.price, xrp.timestamp) == (2.5, 1_700_000_001)
+    # The failed read is left to get_price
+    assert feed._normalize_symbol("ETH") not in feed._price_cache
+    
+    # Fresh entries aren't read again
+    asyncio.run(feed._prefetch_prices(["BTC", "XRP"]))
+    assert len(multicall.calls) == 1
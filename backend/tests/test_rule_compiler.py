@@ -0,0 +1,95 @@
+"""
+Regression tests for the rule condition whitelist in rule_compiler
+"""
+import ast
+
+import pytest
+
+from rule_compiler import SIMPLE_OPS, SimpleRuleBank, compile_condition
+
+
+@pytest.mark.parametrize("condition", [
+    "__import__('os').system('true')",
+    "open('/etc/passwd')",
+    "market_data['price'] > 0",
+    "(1).real",
+    "[x for x in market_data]",
+    "sentiment.risk_level in (allowed, 'Medium')",
+    "price in [price * 2]",
+    "lambda: 1",
+    "price ** 2 > 4",
+    "price // 2 > 4",
+    "price & 1",
+    "price if price else 0",
+    "f'{price}'",
+])
+def test_rejects_expressions_outside_whitelist(condition):
+    with pytest.raises(ValueError):
+        compile_condition(condition)
+
+
+def test_dunder_attribute_is_only_a_flattened_key():
+    # Attribute chains are namespace keys, never getattr() on live objects
+    evaluator = compile_condition("market_data.__class__ == null")
+    assert evaluator.run({"market_data": {}, "market_data.price": 1}) is True
+
+
+@pytest.mark.parametrize("condition, expected", [
+    ("market_data.price > 0 and sentiment.risk_level != 'High'", True),
+    ("market_data.price * 2 - 1 >= 199", True),
+    ("0 < market_data.price <= 100", True),
+    ("not verified or market_data.price < 0", False),
+    ("sentiment.risk_level in allowed_levels", True),
+    ("verified == true and sentiment.missing == null", True),
+    ("-market_data.price % 7 == 5", True),
+    ("sentiment.risk_level in ('Low', 'Medium')", True),
+    ("sentiment.risk_level not in ['Low', 'Medium']", False),
+    ("market_data.price in {-100, 100, null}", True),
+    ("allowed_levels == ('Low', 'Medium')", True),
+])
+def test_evaluates_whitelisted_expressions(condition, expected):
+    namespace = {
+        "market_data": {}, "market_data.price": 100,
+        "sentiment": {}, "sentiment.risk_level": "Low",
+        "verified": True, "allowed_levels": ("Low", "Medium"),
+    }
+    assert compile_condition(condition).run(namespace) is expected
+
+
+def test_unknown_dict_raises_key_error():
+    with pytest.raises(KeyError):
+        compile_condition("unknown.price > 0").run({})
+
+
+def test_referenced_names():
+    evaluator = compile_condition("market_data.price > 0 and verified")
+    assert evaluator.referenced_names == {"market_data.price", "verified"}
+
+
+@pytest.mark.parametrize("condition, simple", [
+    ("market_data.price > 0", ("market_data.price", SIMPLE_OPS[ast.Gt], 0.0)),
+    ("change <= -5", ("change", SIMPLE_OPS[ast.LtE], -5.0)),
+    ("verified == true", ("verified", SIMPLE_OPS[ast.Eq], 1.0)),
+    ("market_data.price > other", None),
+    ("a > 0 and b > 0", None),
+    ("0 < a", None),
+])
+def test_simple_comparison_classification(condition, simple):
+    assert compile_condition(condition).simple_comparison == simple
+
+
+def test_simple_rule_bank_matches_evaluator():
+    conditions = ["price > 10", "price <= 10", "change < -2.5", "change >= 0",
+                  "volume == 5", "volume != 5"]
+    evaluators = [compile_condition(condition) for condition in conditions]
+    bank = SimpleRuleBank([evaluator.simple_comparison for evaluator in evaluators])
+    
+    for namespace in ({"price": 10, "change": -3, "volume": 5},
+                      {"price": 10.5, "change": 0, "volume": 4}):
+        passed, valid = bank.evaluate(namespace)
+        assert valid.all()
+        assert passed.tolist() == [bool(evaluator.run(namespace)) for evaluator in evaluators]
+    
+    # Missing and non-numeric features are left to the general evaluator
+    _, valid = bank.evaluate({"price": "n/a", "change": 1})
+    assert valid.tolist() == [False, False, True, True, False, False]
@@ -0,0 +1,185 @@
+"""
+Regression tests for SentimentAnalyzer batching and its caching helpers
+"""
+import asyncio
+import re
+
+import numpy as np
+import orjson
+import pytest
+
+import sentiment_analyzer
+from sentiment_analyzer import (SentimentAnalyzer, _DiskCache, _RateLimiter, _SnapshotRing,
+                                _bucket_key, _fast_path, _snapshot_vector)
+
+
+def _answer(score):
+    return {"overall_sentiment": score, "short_term_sentiment": score, "medium_term_sentiment": score,
+            "key_factors": [], "risk_level": "Low", "reasoning": "test"}
+
+
+class FakeGemini:
+    """_generate_text stand-in: records calls and tracks how many overlap"""
+    
+    def __init__(self, batch_answer=None):
+        self.batch_answer = batch_answer
+        self.single_calls = []
+        self.batch_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def __call__(self, prompt, generation_config, model=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if "Answer for every token" in prompt:
+                self.batch_calls += 1
+                if self.batch_answer is None:
+                    raise RuntimeError("batch call failed")
+                return orjson.dumps(self.batch_answer).decode()
+            symbol = re.search(r"\((\w+)\):", prompt).group(1)
+            self.single_calls.append(symbol)
+            return orjson.dumps(_answer(-10)).decode()
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(SentimentAnalyzer, "SENTIMENT_DISK_CACHE_PATH", None)
+    instance = SentimentAnalyzer("test-key")
+    yield instance
+    asyncio.run(instance.close())
+
+
+def _item(symbol, price=100.0):
+    return (symbol, symbol, {"price": price}, None)
+
+
+def test_failed_batch_falls_back_to_concurrent_single_calls(analyzer, monkeypatch):
+    gemini = FakeGemini(batch_answer=None)
+    monkeypatch.setattr(analyzer, "_generate_text", gemini)
+    
+    results = asyncio.run(analyzer.analyze_batch([_item(s) for s in ("BTC", "ETH", "SOL", "XRP")]))
+    
+    assert gemini.batch_calls == 1
+    assert sorted(gemini.single_calls) == ["BTC", "ETH", "SOL", "XRP"]
+    assert gemini.max_in_flight == 4
+    assert [result["overall_sentiment"] for result in results] == [-10] * 4
+
+
+def test_tokens_missing_from_batch_answer_get_single_calls(analyzer, monkeypatch):
+    gemini = FakeGemini(batch_answer={"BTC": _answer(40), "ETH": {"overall_sentiment": 500}})
+    monkeypatch.setattr(analyzer, "_generate_text", gemini)
+    
+    results = asyncio.run(analyzer.analyze_batch([_item(s) for s in ("BTC", "ETH", "SOL")]))
+    
+    assert sorted(gemini.single_calls) == ["ETH", "SOL"]
+    assert [result["overall_sentiment"] for result in results] == [40, -10, -10]
+    assert all(result["fdc_verified"] is False for result in results)
+
+
+def test_duplicate_symbols_with_different_market_data(analyzer, monkeypatch):
+    gemini = FakeGemini(batch_answer={"BTC": _answer(40), "ETH": _answer(20)})
+    monkeypatch.setattr(analyzer, "_generate_text", gemini)
+    
+    items = [_item("BTC", 100.0), _item("ETH"), _item("BTC", 100.0), _item("BTC", 250.0)]
+    results = asyncio.run(analyzer.analyze_batch(items))
+    
+    # Same snapshot shares the batched answer; the other BTC snapshot is asked separately
+    assert gemini.single_calls == ["BTC"]
+    assert [result["overall_sentiment"] for result in results] == [40, 20, 40, -10]
+    assert results[0] is not results[2]
+
+
+MARKET = {"price": 64123.45, "percent_change_1h": 0.42, "percent_change_24h": -1.31,
+          "percent_change_7d": 3.07, "market_cap": 1.26e12, "volume_24h": 3.1e10}
+
+
+def test_bucket_key_is_stable_for_near_identical_snapshots():
+    key = _bucket_key("BTC", MARKET, False)
+    jittered = dict(reversed(list(MARKET.items())), price=64124.1, percent_change_1h=0.44, volume_24h=3.2e10)
+    
+    assert _bucket_key("BTC", dict(MARKET), False) == key
+    assert _bucket_key("BTC", jittered, False) == key
+    assert _bucket_key("BTC", dict(MARKET, price=66000.0), False) != key
+    assert _bucket_key("BTC", MARKET, True) != key
+    assert _bucket_key("ETH", MARKET, False) != key
+    assert _bucket_key("BTC", {}, False) == _bucket_key("BTC", {"price": None}, False)
+
+
+def test_snapshot_ring_hits_misses_and_expiry():
+    ring = _SnapshotRing(2)
+    vector = _snapshot_vector(MARKET)
+    ring.add(vector, _answer(30), expires_at=100.0)
+    
+    assert ring.find(_snapshot_vector(dict(MARKET, percent_change_24h=-1.2)), now=50.0) == _answer(30)
+    assert ring.find(_snapshot_vector(dict(MARKET, percent_change_24h=8.0)), now=50.0) is None
+    assert ring.find(vector, now=100.0) is None
+    
+    # Full ring overwrites its oldest slot
+    ring.add(vector * 0, _answer(10), expires_at=200.0)
+    ring.add(vector * 2, _answer(20), expires_at=200.0)
+    assert ring.find(vector, now=50.0) is None
+    assert ring.find(vector * 2, now=50.0) == _answer(20)
+
+
+def test_empty_snapshot_ring_misses():
+    ring = _SnapshotRing(4)
+    assert ring.find(np.zeros(ring.vectors.shape[1]), now=0.0) is None
+
+
+def test_disk_cache_round_trip_and_expiry(tmp_path):
+    path = str(tmp_path / "cache" / "sentiment.sqlite3")
+    cache = _DiskCache(path)
+    cache.put(b"fresh", _answer(25), ttl_seconds=60)
+    cache.put(b"stale", _answer(5), ttl_seconds=-1)
+    cache.close()
+    
+    # A new instance (restart or another worker) reads the same file
+    cache = _DiskCache(path)
+    try:
+        seconds_left, sentiment_data = cache.get(b"fresh")
+        assert 0 < seconds_left <= 60
+        assert sentiment_data == _answer(25)
+        assert cache.get(b"stale") is None
+        assert cache.get(b"missing") is None
+    finally:
+        cache.close()
+
+
+def test_rate_limiter_refills_over_time():
+    limiter = _RateLimiter(rate=2, period=1.0)
+    assert limiter._take() == 0.0
+    assert limiter._take() == 0.0
+    
+    delay = limiter._take()
+    assert 0.4 < delay <= 0.5
+    
+    # Half a period later one token has refilled
+    limiter.updated -= 0.5
+    assert limiter._take() == 0.0
+    assert limiter._take() > 0
+    
+    # Refill is capped at the bucket size
+    limiter.updated -= 10
+    assert [limiter._take() for _ in range(2)] == [0.0, 0.0]
+    assert limiter._take() > 0
+
+
+@pytest.mark.parametrize("change_24h, change_1h, risk_level", [
+    (20.0, 6.0, "Medium"),
+    (-35.0, -7.0, "High"),
+    (20.0, -6.0, None),
+    (10.0, 6.0, None),
+    (20.0, 3.0, None),
+])
+def test_fast_path_only_for_extreme_moves_in_one_direction(change_24h, change_1h, risk_level):
+    result = _fast_path({"percent_change_24h": change_24h, "percent_change_1h": change_1h})
+    if risk_level is None:
+        assert result is None
+        return
+    assert result["risk_level"] == risk_level
+    assert (result["overall_sentiment"] > 0) == (change_24h > 0)
+    assert sentiment_analyzer._is_valid_sentiment(result)
@@ -124,4 +124,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop (optional, Linux/macOS) makes each polling tick cheaper;
+    # without it the default asyncio loop is used
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -32,6 +32,9 @@ setup(
         "pydantic>=2.0.0",
     ],
     extras_require={
+        "fast": [
+            "uvloop>=0.18.0; sys_platform != 'win32'",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",